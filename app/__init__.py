@@ -6,8 +6,15 @@ from logging.handlers import RotatingFileHandler
 from flask import Flask, redirect, request, url_for
 from flask_login import current_user
 
+from .cache import init_data_cache
+from .commands import register_commands
 from .extensions import db, migrate, login_manager, csrf
+from .identity import init_identity_cache, load_identity
+from .instrumentation import init_instrumentation, slow_query_logger
+from .metrics import init_metrics
 from .models import User, ClubManager, UserRole
+from .passwords import init_password_hasher
+from .ratelimit import init_rate_limiter
 
 
 def create_app(config_name=None):
@@ -18,6 +25,8 @@ def create_app(config_name=None):
         "development": "config.DevelopmentConfig",
         "production": "config.ProductionConfig",
         "testing": "config.TestingConfig",
+        "loadtest": "config.LoadTestConfig",
+        "benchmark": "config.BenchmarkConfig",
     }
     app.config.from_object(config_map.get(config_name, "config.DevelopmentConfig"))
 
@@ -28,23 +37,19 @@ def create_app(config_name=None):
     login_manager.init_app(app)
     csrf.init_app(app)
     configure_logging(app)
+    init_instrumentation(app)
+    init_metrics(app)
+    init_identity_cache(app)
+    init_rate_limiter(app)
+    init_password_hasher(app)
+    init_data_cache(app)
 
     login_manager.login_view = "auth.login"
     login_manager.session_protection = "strong"
 
     @login_manager.user_loader
     def load_user(user_id):
-        if not user_id:
-            return None
-        if user_id.startswith("user:"):
-            raw_id = user_id.split(":", 1)[1]
-            if raw_id.isdigit():
-                return db.session.get(User, int(raw_id))
-        if user_id.startswith("manager:"):
-            raw_id = user_id.split(":", 1)[1]
-            if raw_id.isdigit():
-                return db.session.get(ClubManager, int(raw_id))
-        return None
+        return load_identity(user_id)
 
     @login_manager.unauthorized_handler
     def unauthorized():
@@ -55,10 +60,13 @@ def create_app(config_name=None):
     @app.context_processor
     def inject_globals():
         role = None
+        unread_notifications = 0
         if isinstance(current_user._get_current_object(), User):
             role = current_user.role
+            unread_notifications = current_user.unread_notifications or 0
         return {
             "current_role": role,
+            "unread_notifications": unread_notifications,
             "is_manager": isinstance(current_user._get_current_object(), ClubManager),
             "UserRole": UserRole,
         }
@@ -74,6 +82,7 @@ def create_app(config_name=None):
     app.register_blueprint(admin_bp, url_prefix="/admin")
 
     register_error_handlers(app)
+    register_commands(app)
 
     return app
 
@@ -96,6 +105,17 @@ def configure_logging(app):
         app.logger.addHandler(handler)
     app.logger.setLevel(logging.INFO)
 
+    if app.config.get("SLOW_QUERY_THRESHOLD_MS") is None:
+        return
+    slow_logger = slow_query_logger(app)
+    if not slow_logger.handlers:
+        slow_handler = RotatingFileHandler(
+            log_dir / "slow_queries.log", maxBytes=5_000_000, backupCount=3
+        )
+        slow_handler.setFormatter(formatter)
+        slow_logger.addHandler(slow_handler)
+    slow_logger.setLevel(logging.WARNING)
+
 
 def register_error_handlers(app):
     from flask import render_template
@@ -108,6 +128,13 @@ def register_error_handlers(app):
     def not_found(error):
         return render_template("errors/404.html"), 404
 
+    @app.errorhandler(503)
+    def service_unavailable(error):
+        response = error.get_response()
+        response.set_data(render_template("errors/503.html"))
+        response.mimetype = "text/html"
+        return response
+
     @app.errorhandler(500)
     def server_error(error):
         return render_template("errors/500.html"), 500
@@ -1,24 +1,40 @@
 import secrets
 from datetime import datetime
 
-from flask import Blueprint, flash, redirect, render_template, url_for, abort
+from flask import (
+    Blueprint,
+    Response,
+    abort,
+    current_app,
+    flash,
+    redirect,
+    render_template,
+    request,
+    url_for,
+)
 from flask_login import current_user
-from werkzeug.security import generate_password_hash
+from sqlalchemy.orm import joinedload
 
+from ..cache import invalidate
 from ..extensions import db
 from ..forms.admin import ClubDecisionForm, EventDecisionForm
+from ..metrics import render_metrics
 from ..models import (
     ClubApplication,
     ClubApplicationStatus,
+    ClubFounderInvitation,
     Club,
     ClubStatus,
     ClubManager,
     AuditActorType,
     Event,
     EventStatus,
+    Membership,
     NotificationType,
 )
+from ..passwords import hash_password
 from ..rbac import admin_required
+from ..search import index_club
 from ..utils import create_notification, log_audit
 
 
@@ -53,12 +69,17 @@ def dashboard():
 @admin_bp.route("/club-applications")
 @admin_required
 def club_applications():
-    pending = ClubApplication.query.filter_by(
-        status=ClubApplicationStatus.PENDING
-    ).order_by(ClubApplication.created_at.desc())
+    pending = (
+        ClubApplication.query.filter_by(status=ClubApplicationStatus.PENDING)
+        .options(joinedload(ClubApplication.applicant))
+        .order_by(ClubApplication.created_at.desc())
+        .all()
+    )
     decided = ClubApplication.query.filter(
-        ClubApplication.status != ClubApplicationStatus.PENDING
-    ).order_by(ClubApplication.decided_at.desc())
+        ClubApplication.status.in_(
+            [ClubApplicationStatus.APPROVED, ClubApplicationStatus.REJECTED]
+        )
+    ).order_by(ClubApplication.decided_at.desc()).all()
     return render_template(
         "admin/club_applications.html", pending=pending, decided=decided
     )
@@ -100,10 +121,12 @@ def club_application_detail(application_id):
             )
             db.session.add(club)
             db.session.flush()
+            index_club(club)
+            invalidate("clubs", f"club:{club.id}")
             manager = ClubManager(
                 club_id=club.id,
                 email=club_email,
-                password_hash=generate_password_hash(raw_password),
+                password_hash=hash_password(raw_password),
             )
             db.session.add(manager)
             application.status = ClubApplicationStatus.APPROVED
@@ -150,9 +173,13 @@ def club_application_detail(application_id):
         flash("Decision recorded.", "success")
         return redirect(url_for("admin.club_applications"))
 
+    founders = application.founders.options(
+        joinedload(ClubFounderInvitation.invited_student)
+    ).all()
     return render_template(
         "admin/club_application_detail.html",
         application=application,
+        founders=founders,
         form=form,
     )
 
@@ -160,12 +187,15 @@ def club_application_detail(application_id):
 @admin_bp.route("/events/proposals")
 @admin_required
 def event_proposals():
-    pending = Event.query.filter_by(status=EventStatus.PENDING_APPROVAL).order_by(
-        Event.created_at.desc()
-    )
-    decided = Event.query.filter(Event.status != EventStatus.PENDING_APPROVAL).order_by(
-        Event.decided_at.desc()
+    pending = (
+        Event.query.filter_by(status=EventStatus.PENDING_APPROVAL)
+        .options(joinedload(Event.club))
+        .order_by(Event.created_at.desc())
+        .all()
     )
+    decided = Event.query.filter(
+        Event.status.in_([EventStatus.APPROVED, EventStatus.REJECTED, EventStatus.CANCELLED])
+    ).order_by(Event.decided_at.desc()).all()
     return render_template("admin/event_proposals.html", pending=pending, decided=decided)
 
 
@@ -220,6 +250,7 @@ def event_proposal_detail(event_id):
                 details=form.admin_comment.data or "",
             )
 
+        invalidate("events", f"events:club:{event.club_id}")
         db.session.commit()
         flash("Decision recorded.", "success")
         return redirect(url_for("admin.event_proposals"))
@@ -227,6 +258,29 @@ def event_proposal_detail(event_id):
     return render_template("admin/event_proposal_detail.html", event=event, form=form)
 
 
+def _metrics_response():
+    if "metrics" not in current_app.extensions:
+        abort(404)
+    return Response(
+        render_metrics(current_app._get_current_object()),
+        mimetype="text/plain; version=0.0.4",
+    )
+
+
+@admin_required
+def _admin_metrics():
+    return _metrics_response()
+
+
+@admin_bp.route("/metrics")
+def metrics():
+    token = current_app.config.get("METRICS_TOKEN")
+    authorization = request.headers.get("Authorization", "")
+    if token and secrets.compare_digest(authorization, f"Bearer {token}"):
+        return _metrics_response()
+    return _admin_metrics()
+
+
 @admin_bp.route("/clubs")
 @admin_required
 def clubs():
@@ -240,5 +294,7 @@ def club_members(club_id):
     club = db.session.get(Club, club_id)
     if not club:
         abort(404)
-    members = club.memberships.filter_by(is_active=True).all()
+    members = (
+        club.memberships.filter_by(is_active=True).options(joinedload(Membership.user)).all()
+    )
     return render_template("admin/club_members.html", club=club, members=members)
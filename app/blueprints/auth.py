@@ -1,34 +1,15 @@
-from datetime import datetime, timedelta
-
 from flask import Blueprint, flash, redirect, render_template, request, url_for
 from flask_login import login_user, logout_user, current_user
-from werkzeug.security import check_password_hash, generate_password_hash
 
 from ..extensions import db
 from ..forms.auth import RegisterForm, LoginForm
 from ..models import User, UserRole
+from ..passwords import check_password, hash_password
+from ..ratelimit import login_limiter
 
 
 auth_bp = Blueprint("auth", __name__)
 
-LOGIN_ATTEMPTS = {}
-MAX_ATTEMPTS = 5
-WINDOW_SECONDS = 300
-
-
-def _rate_limited(ip_address):
-    now = datetime.utcnow()
-    window_start = now - timedelta(seconds=WINDOW_SECONDS)
-    attempts = LOGIN_ATTEMPTS.get(ip_address, [])
-    attempts = [ts for ts in attempts if ts > window_start]
-    LOGIN_ATTEMPTS[ip_address] = attempts
-    return len(attempts) >= MAX_ATTEMPTS
-
-
-def _record_attempt(ip_address):
-    LOGIN_ATTEMPTS.setdefault(ip_address, []).append(datetime.utcnow())
-
-
 def _login_redirect(user):
     if user.role == UserRole.SKS_ADMIN:
         return redirect(url_for("admin.dashboard"))
@@ -52,7 +33,7 @@ def register():
             surname=form.surname.data.strip(),
             university_id=form.university_id.data.strip(),
             email=email,
-            password_hash=generate_password_hash(form.password.data),
+            password_hash=hash_password(form.password.data),
         )
         db.session.add(user)
         db.session.commit()
@@ -70,19 +51,20 @@ def login():
         return redirect(url_for("manager.dashboard"))
 
     form = LoginForm()
-    ip_address = request.remote_addr or "unknown"
+    limiter = login_limiter()
+    limit_key = f"auth:{request.remote_addr or 'unknown'}"
     if form.validate_on_submit():
-        if _rate_limited(ip_address):
+        if limiter.blocked(limit_key):
             flash("Too many login attempts. Try again later.", "error")
             return render_template("auth/login.html", form=form)
 
         email = form.email.data.lower()
         user = User.query.filter_by(email=email).first()
-        if user and user.is_active and check_password_hash(user.password_hash, form.password.data):
+        if user and user.is_active and check_password(user, form.password.data):
             login_user(user)
             return _login_redirect(user)
 
-        _record_attempt(ip_address)
+        limiter.hit(limit_key)
         flash("Invalid credentials.", "error")
 
     return render_template("auth/login.html", form=form)
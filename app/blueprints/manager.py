@@ -1,8 +1,8 @@
-from datetime import datetime, timedelta
+from datetime import datetime
 
 from flask import Blueprint, flash, redirect, render_template, request, url_for, abort
 from flask_login import current_user, login_user, logout_user
-from werkzeug.security import check_password_hash
+from sqlalchemy.orm import joinedload
 
 from ..extensions import db
 from ..forms.auth import ManagerLoginForm
@@ -23,30 +23,16 @@ from ..models import (
     NotificationType,
     EventRegistration,
 )
+from ..cache import cached, invalidate
+from ..passwords import check_password
+from ..ratelimit import login_limiter
 from ..rbac import manager_required
-from ..utils import create_notification
+from ..search import index_club
+from ..utils import create_notification, notify_club_members
 
 
 manager_bp = Blueprint("manager", __name__)
 
-LOGIN_ATTEMPTS = {}
-MAX_ATTEMPTS = 5
-WINDOW_SECONDS = 300
-
-
-def _rate_limited(ip_address):
-    now = datetime.utcnow()
-    window_start = now - timedelta(seconds=WINDOW_SECONDS)
-    attempts = LOGIN_ATTEMPTS.get(ip_address, [])
-    attempts = [ts for ts in attempts if ts > window_start]
-    LOGIN_ATTEMPTS[ip_address] = attempts
-    return len(attempts) >= MAX_ATTEMPTS
-
-
-def _record_attempt(ip_address):
-    LOGIN_ATTEMPTS.setdefault(ip_address, []).append(datetime.utcnow())
-
-
 def _manager_club():
     return getattr(current_user, "club", None)
 
@@ -56,16 +42,17 @@ def login():
     if current_user.is_authenticated and hasattr(current_user, "club_id"):
         return redirect(url_for("manager.dashboard"))
     form = ManagerLoginForm()
-    ip_address = request.remote_addr or "unknown"
+    limiter = login_limiter()
+    limit_key = f"manager:{request.remote_addr or 'unknown'}"
     if form.validate_on_submit():
-        if _rate_limited(ip_address):
+        if limiter.blocked(limit_key):
             flash("Too many login attempts. Try again later.", "error")
             return render_template("manager/login.html", form=form)
         manager = ClubManager.query.filter_by(email=form.email.data.lower()).first()
-        if manager and manager.is_active and check_password_hash(manager.password_hash, form.password.data):
+        if manager and manager.is_active and check_password(manager, form.password.data):
             login_user(manager)
             return redirect(url_for("manager.dashboard"))
-        _record_attempt(ip_address)
+        limiter.hit(limit_key)
         flash("Invalid credentials.", "error")
     return render_template("manager/login.html", form=form)
 
@@ -122,6 +109,8 @@ def club_profile():
         club.category = form.category.data
         club.logo_url = form.logo_url.data
         club.contact_email = form.contact_email.data
+        index_club(club)
+        invalidate("clubs", f"club:{club.id}")
         db.session.commit()
         flash("Club profile updated.", "success")
         return redirect(url_for("manager.club_profile"))
@@ -134,13 +123,23 @@ def membership_applications():
     club = _manager_club()
     if not club:
         abort(403)
-    pending = MembershipApplication.query.filter_by(
-        club_id=club.id, status=MembershipApplicationStatus.PENDING
-    ).order_by(MembershipApplication.created_at.desc())
-    history = MembershipApplication.query.filter(
-        MembershipApplication.club_id == club.id,
-        MembershipApplication.status != MembershipApplicationStatus.PENDING,
-    ).order_by(MembershipApplication.decided_at.desc())
+    pending = (
+        MembershipApplication.query.filter_by(
+            club_id=club.id, status=MembershipApplicationStatus.PENDING
+        )
+        .options(joinedload(MembershipApplication.user))
+        .order_by(MembershipApplication.created_at.desc())
+        .all()
+    )
+    history = (
+        MembershipApplication.query.filter(
+            MembershipApplication.club_id == club.id,
+            MembershipApplication.status != MembershipApplicationStatus.PENDING,
+        )
+        .options(joinedload(MembershipApplication.user))
+        .order_by(MembershipApplication.decided_at.desc())
+        .all()
+    )
     form = MembershipDecisionForm()
     return render_template(
         "manager/membership_applications.html",
@@ -228,16 +227,14 @@ def new_announcement():
         )
         db.session.add(announcement)
         db.session.flush()
-        members = Membership.query.filter_by(club_id=club.id, is_active=True).all()
-        for member in members:
-            create_notification(
-                member.user_id,
-                NotificationType.ANNOUNCEMENT,
-                f"{club.name} Announcement",
-                announcement.title,
-                related_object_type="Announcement",
-                related_object_id=announcement.id,
-            )
+        notify_club_members(
+            club.id,
+            NotificationType.ANNOUNCEMENT,
+            f"{club.name} Announcement",
+            announcement.title,
+            related_object_type="Announcement",
+            related_object_id=announcement.id,
+        )
         db.session.commit()
         flash("Announcement posted.", "success")
         return redirect(url_for("manager.announcements"))
@@ -250,7 +247,13 @@ def events():
     club = _manager_club()
     if not club:
         abort(403)
-    events = Event.query.filter_by(club_id=club.id).order_by(Event.start_datetime.desc())
+    events = cached(
+        ("club-events", club.id),
+        [f"events:club:{club.id}"],
+        lambda: Event.query.filter_by(club_id=club.id)
+        .order_by(Event.start_datetime.desc())
+        .all(),
+    )
     return render_template("manager/events.html", events=events)
 
 
@@ -275,6 +278,7 @@ def new_event():
             created_by_manager_id=current_user.id,
         )
         db.session.add(event)
+        invalidate(f"events:club:{club.id}")
         db.session.commit()
         flash("Event proposal submitted.", "success")
         return redirect(url_for("manager.events"))
@@ -288,8 +292,11 @@ def event_registrations(event_id):
     if not club:
         abort(403)
     event = Event.query.filter_by(id=event_id, club_id=club.id).first_or_404()
-    registrations = EventRegistration.query.filter_by(event_id=event.id).order_by(
-        EventRegistration.registered_at.desc()
+    registrations = (
+        EventRegistration.query.filter_by(event_id=event.id)
+        .options(joinedload(EventRegistration.user))
+        .order_by(EventRegistration.registered_at.desc())
+        .all()
     )
     return render_template(
         "manager/event_registrations.html", event=event, registrations=registrations
@@ -2,7 +2,12 @@ from datetime import datetime
 
 from flask import Blueprint, flash, redirect, render_template, request, url_for, abort, current_app
 from flask_login import current_user
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased, joinedload
 
+from ..cache import cached
+from ..conditional import conditional, page_version
 from ..extensions import db
 from ..forms.student import (
     ClubApplicationForm,
@@ -30,7 +35,21 @@ from ..models import (
     EventRegistrationStatus,
 )
 from ..rbac import student_required
-from ..utils import create_notification, get_page
+from ..search import search_clubs
+from ..utils import (
+    cached_count,
+    claim_event_seat,
+    create_notification,
+    create_notifications,
+    decode_cursor,
+    get_page,
+    keyset_paginate,
+    mark_notifications_read,
+    next_waitlist_position,
+    promote_waitlist,
+    release_event_seat,
+    waitlist_rank,
+)
 
 
 student_bp = Blueprint("student", __name__)
@@ -54,26 +73,95 @@ def dashboard():
     return render_template("student/dashboard.html", notifications=notifications)
 
 
+def _listing_page(query, columns, count_key, tags=(), version=None):
+    config = current_app.config
+    per_page = config.get("ITEMS_PER_PAGE", 10)
+    if version is not None:
+        # The validator row leads with the exact count, so the total shown
+        # always matches the ETag it is revalidated against.
+        total = version[0]
+    else:
+        total = cached_count(count_key, query, config.get("LISTING_COUNT_TTL", 30))
+    if columns is None or config.get("LISTING_PAGINATION") == "offset":
+        if columns is not None:
+            query = query.order_by(*columns)
+        pagination = query.paginate(
+            page=get_page(), per_page=per_page, error_out=False, count=False
+        )
+        pagination.total = total
+        return pagination
+    cursor = request.args.get("cursor")
+    page = cached(
+        ("listing", *count_key, cursor, per_page, version),
+        tags,
+        lambda: keyset_paginate(query, columns, cursor=cursor, per_page=per_page),
+    )
+    page.total = total
+    return page
+
+
+def _clubs_version():
+    return select(func.count(Club.id), func.max(Club.updated_at)).where(
+        Club.status == ClubStatus.APPROVED
+    )
+
+
 @student_bp.route("/clubs")
 @student_required
+@conditional(_clubs_version)
 def clubs():
-    page = get_page()
     query = Club.query.filter_by(status=ClubStatus.APPROVED)
     search = request.args.get("q")
     if search:
-        like = f"%{search}%"
-        query = query.filter(Club.name.ilike(like))
-    per_page = current_app.config.get("ITEMS_PER_PAGE", 10)
-    pagination = query.order_by(Club.name.asc()).paginate(
-        page=page, per_page=per_page, error_out=False
+        pagination = _listing_page(search_clubs(query, search), None, ("clubs", search))
+    else:
+        pagination = _listing_page(
+            query, [Club.name, Club.id], ("clubs", ""), ["clubs"], page_version()
+        )
+    return render_template(
+        "student/clubs.html",
+        pagination=pagination,
+        search=search,
+        cursor=request.args.get("cursor"),
     )
-    return render_template("student/clubs.html", pagination=pagination, search=search)
+
+
+def _club_version(club_id):
+    own_applications = (
+        MembershipApplication.club_id == club_id,
+        MembershipApplication.user_id == current_user.id,
+    )
+    return select(
+        Club.updated_at,
+        select(func.count(MembershipApplication.id)).where(*own_applications).scalar_subquery(),
+        select(func.max(MembershipApplication.decided_at))
+        .where(*own_applications)
+        .scalar_subquery(),
+        select(func.count(Membership.id))
+        .where(
+            Membership.club_id == club_id,
+            Membership.user_id == current_user.id,
+            Membership.is_active.is_(True),
+        )
+        .scalar_subquery(),
+    ).where(Club.id == club_id, Club.status == ClubStatus.APPROVED)
 
 
 @student_bp.route("/clubs/<int:club_id>")
 @student_required
+@conditional(_club_version)
 def club_detail(club_id):
-    club = Club.query.filter_by(id=club_id, status=ClubStatus.APPROVED).first_or_404()
+    version = page_version()
+    if version is None:
+        abort(404)
+    updated_at = version[0]
+    club = cached(
+        ("club", club_id, updated_at),
+        [f"club:{club_id}"],
+        lambda: Club.query.filter_by(id=club_id, status=ClubStatus.APPROVED).first(),
+    )
+    if club is None:
+        abort(404)
     form = MembershipApplicationForm()
     existing_application = MembershipApplication.query.filter(
         MembershipApplication.club_id == club.id,
@@ -134,9 +222,16 @@ def apply_membership(club_id):
 @student_bp.route("/me/clubs")
 @student_required
 def my_clubs():
-    memberships = Membership.query.filter_by(user_id=current_user.id, is_active=True).all()
-    applications = MembershipApplication.query.filter_by(user_id=current_user.id).order_by(
-        MembershipApplication.created_at.desc()
+    memberships = (
+        Membership.query.filter_by(user_id=current_user.id, is_active=True)
+        .options(joinedload(Membership.club))
+        .all()
+    )
+    applications = (
+        MembershipApplication.query.filter_by(user_id=current_user.id)
+        .options(joinedload(MembershipApplication.club))
+        .order_by(MembershipApplication.created_at.desc())
+        .all()
     )
     return render_template(
         "student/my_clubs.html", memberships=memberships, applications=applications
@@ -176,7 +271,9 @@ def club_application_detail(app_id):
     application = ClubApplication.query.filter_by(
         id=app_id, applicant_user_id=current_user.id
     ).first_or_404()
-    founders = application.founders.all()
+    founders = application.founders.options(
+        joinedload(ClubFounderInvitation.invited_student)
+    ).all()
     return render_template(
         "student/club_application_detail.html", application=application, founders=founders
     )
@@ -222,7 +319,9 @@ def manage_founders(app_id):
         flash("Founder invited.", "success")
         return redirect(url_for("student.manage_founders", app_id=application.id))
 
-    founders = application.founders.all()
+    founders = application.founders.options(
+        joinedload(ClubFounderInvitation.invited_student)
+    ).all()
     return render_template(
         "student/club_application_founders.html",
         application=application,
@@ -251,9 +350,12 @@ def remove_founder(app_id, invite_id):
 @student_bp.route("/founder-invitations")
 @student_required
 def founder_invitations():
-    invites = ClubFounderInvitation.query.filter_by(
-        invited_student_id=current_user.id
-    ).order_by(ClubFounderInvitation.id.desc())
+    invites = (
+        ClubFounderInvitation.query.filter_by(invited_student_id=current_user.id)
+        .options(joinedload(ClubFounderInvitation.club_application))
+        .order_by(ClubFounderInvitation.id.desc())
+        .all()
+    )
     form = SimpleSubmitForm()
     return render_template("student/founder_invitations.html", invites=invites, form=form)
 
@@ -308,33 +410,77 @@ def reject_invite(invite_id):
     return redirect(url_for("student.founder_invitations"))
 
 
+def _events_version():
+    statement = select(func.count(Event.id), func.max(Event.decided_at)).where(
+        Event.status == EventStatus.APPROVED
+    )
+    club_id = request.args.get("club_id")
+    if club_id and club_id.isdigit():
+        statement = statement.where(Event.club_id == int(club_id))
+    return statement
+
+
 @student_bp.route("/events")
 @student_required
+@conditional(_events_version)
 def events():
-    page = get_page()
     query = Event.query.filter_by(status=EventStatus.APPROVED)
     club_id = request.args.get("club_id")
     if club_id and club_id.isdigit():
         query = query.filter_by(club_id=int(club_id))
-    per_page = current_app.config.get("ITEMS_PER_PAGE", 10)
-    pagination = query.order_by(Event.start_datetime.asc()).paginate(
-        page=page, per_page=per_page, error_out=False
+    else:
+        club_id = None
+    pagination = _listing_page(
+        query,
+        [Event.start_datetime, Event.id],
+        ("events", club_id or ""),
+        ["events"],
+        page_version(),
+    )
+    return render_template(
+        "student/events.html",
+        pagination=pagination,
+        club_id=club_id,
+        cursor=request.args.get("cursor"),
     )
-    return render_template("student/events.html", pagination=pagination)
+
+
+def _event_version(event_id):
+    own = (EventRegistration.event_id == event_id, EventRegistration.user_id == current_user.id)
+    position = select(EventRegistration.waitlist_position).where(*own).scalar_subquery()
+    waiting = aliased(EventRegistration)
+    return select(
+        Event.decided_at,
+        Event.registered_count,
+        select(EventRegistration.status).where(*own).scalar_subquery(),
+        position,
+        select(func.count(waiting.id))
+        .where(
+            waiting.event_id == event_id,
+            waiting.status == EventRegistrationStatus.WAITLISTED,
+            waiting.waitlist_position < position,
+        )
+        .scalar_subquery(),
+    ).where(Event.id == event_id, Event.status == EventStatus.APPROVED)
 
 
 @student_bp.route("/events/<int:event_id>")
 @student_required
+@conditional(_event_version)
 def event_detail(event_id):
     event = Event.query.filter_by(id=event_id, status=EventStatus.APPROVED).first_or_404()
     registration = EventRegistration.query.filter_by(
         event_id=event.id, user_id=current_user.id
     ).first()
+    waitlist_position = None
+    if registration and registration.status == EventRegistrationStatus.WAITLISTED:
+        waitlist_position = waitlist_rank(registration)
     form = SimpleSubmitForm()
     return render_template(
         "student/event_detail.html",
         event=event,
         registration=registration,
+        waitlist_position=waitlist_position,
         form=form,
     )
 
@@ -350,9 +496,6 @@ def register_event(event_id):
     if now > event.start_datetime:
         flash("Event has already started.", "error")
         return redirect(url_for("student.event_detail", event_id=event.id))
-    if event.is_full:
-        flash("Event is full.", "error")
-        return redirect(url_for("student.event_detail", event_id=event.id))
 
     registration = EventRegistration.query.filter_by(
         event_id=event.id, user_id=current_user.id
@@ -360,18 +503,53 @@ def register_event(event_id):
     if registration and registration.status == EventRegistrationStatus.REGISTERED:
         flash("You are already registered.", "info")
         return redirect(url_for("student.event_detail", event_id=event.id))
+    if registration and registration.status == EventRegistrationStatus.WAITLISTED:
+        flash("You are already on the waitlist.", "info")
+        return redirect(url_for("student.event_detail", event_id=event.id))
+
+    seat_claimed = claim_event_seat(event.id)
+    if seat_claimed:
+        values = {
+            "status": EventRegistrationStatus.REGISTERED,
+            "waitlist_position": None,
+        }
+    else:
+        values = {
+            "status": EventRegistrationStatus.WAITLISTED,
+            "waitlist_position": next_waitlist_position(event.id),
+        }
+    values.update(registered_at=now, cancelled_at=None)
 
     if registration:
-        registration.status = EventRegistrationStatus.REGISTERED
-        registration.registered_at = datetime.utcnow()
-        registration.cancelled_at = None
+        stored = db.session.execute(
+            update(EventRegistration)
+            .where(
+                EventRegistration.id == registration.id,
+                EventRegistration.status == EventRegistrationStatus.CANCELLED,
+            )
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        ).rowcount
     else:
-        registration = EventRegistration(event_id=event.id, user_id=current_user.id)
-        db.session.add(registration)
+        db.session.add(
+            EventRegistration(event_id=event.id, user_id=current_user.id, **values)
+        )
+        try:
+            db.session.flush()
+            stored = 1
+        except IntegrityError:
+            stored = 0
+    if not stored:
+        db.session.rollback()
+        flash("You are already registered.", "info")
+        return redirect(url_for("student.event_detail", event_id=event_id))
 
     db.session.commit()
-    flash("Registered for event.", "success")
-    return redirect(url_for("student.event_detail", event_id=event.id))
+    if seat_claimed:
+        flash("Registered for event.", "success")
+    else:
+        flash("Event is full. You have been added to the waitlist.", "info")
+    return redirect(url_for("student.event_detail", event_id=event_id))
 
 
 @student_bp.route("/events/<int:event_id>/cancel", methods=["POST"])
@@ -381,15 +559,40 @@ def cancel_event(event_id):
     registration = EventRegistration.query.filter_by(
         event_id=event.id, user_id=current_user.id
     ).first_or_404()
-    if registration.status != EventRegistrationStatus.REGISTERED:
+    previous_status = registration.status
+    if previous_status == EventRegistrationStatus.CANCELLED:
         flash("Registration already cancelled.", "info")
         return redirect(url_for("student.event_detail", event_id=event.id))
 
-    registration.status = EventRegistrationStatus.CANCELLED
-    registration.cancelled_at = datetime.utcnow()
+    cancelled = db.session.execute(
+        update(EventRegistration)
+        .where(
+            EventRegistration.id == registration.id,
+            EventRegistration.status == previous_status,
+        )
+        .values(
+            status=EventRegistrationStatus.CANCELLED,
+            cancelled_at=datetime.utcnow(),
+            waitlist_position=None,
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if cancelled and previous_status == EventRegistrationStatus.REGISTERED:
+        release_event_seat(event.id)
+        create_notifications(
+            promote_waitlist(event.id),
+            NotificationType.EVENT_STATUS,
+            "Waitlist Promotion",
+            f"A seat opened up and you are now registered for '{event.title}'.",
+            related_object_type="Event",
+            related_object_id=event.id,
+        )
     db.session.commit()
-    flash("Registration cancelled.", "info")
-    return redirect(url_for("student.event_detail", event_id=event.id))
+    if previous_status == EventRegistrationStatus.WAITLISTED:
+        flash("You left the waitlist.", "info")
+    else:
+        flash("Registration cancelled.", "info")
+    return redirect(url_for("student.event_detail", event_id=event_id))
 
 
 @student_bp.route("/notifications", methods=["GET", "POST"])
@@ -397,19 +600,44 @@ def cancel_event(event_id):
 def notifications():
     form = SimpleSubmitForm()
     if form.validate_on_submit():
-        notification_id = request.form.get("notification_id")
-        if notification_id and notification_id.isdigit():
-            note = current_user.notifications.filter_by(id=int(notification_id)).first()
-            if note:
-                note.is_read = True
-                db.session.commit()
-        return redirect(url_for("student.notifications"))
-
-    notifications = current_user.notifications.order_by(
-        Notification.created_at.desc()
-    ).all()
+        action = request.form.get("action")
+        marked = 0
+        if action == "all":
+            marked = mark_notifications_read(current_user.id)
+        elif action == "older":
+            before = decode_cursor(
+                request.form.get("before", ""), [Notification.created_at, Notification.id]
+            )
+            if before:
+                marked = mark_notifications_read(current_user.id, before=before)
+        else:
+            ids = [
+                int(value)
+                for value in request.form.getlist("notification_id")
+                if value.isdigit()
+            ]
+            if ids:
+                marked = mark_notifications_read(current_user.id, ids=ids)
+        if marked:
+            db.session.commit()
+        return redirect(
+            url_for("student.notifications", cursor=request.form.get("cursor") or None)
+        )
+
+    cursor = request.args.get("cursor")
+    page = keyset_paginate(
+        current_user.notifications,
+        [Notification.created_at, Notification.id],
+        cursor=cursor,
+        per_page=current_app.config.get("NOTIFICATIONS_PER_PAGE", 20),
+        descending=True,
+    )
     return render_template(
-        "student/notifications.html", notifications=notifications, form=form
+        "student/notifications.html",
+        notifications=page.items,
+        page=page,
+        cursor=cursor,
+        form=form,
     )
 
 
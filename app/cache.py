@@ -0,0 +1,224 @@
+import pickle
+import random
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from .extensions import db
+from .sqlite_store import LocalSQLiteStore
+
+
+class MemoryCache:
+    """Per-process store: an LRU of at most ``max_entries`` pickled values."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.tags = {}
+
+    def get(self, key):
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, data, ttl):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + ttl, data)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def tag_versions(self, tags):
+        with self.lock:
+            return {tag: self.tags.get(tag, 0) for tag in tags}
+
+    def bump(self, tags):
+        with self.lock:
+            for tag in tags:
+                self.tags[tag] = self.tags.get(tag, 0) + 1
+
+
+class SQLiteCache(LocalSQLiteStore):
+    """Store shared by every worker on the host through one SQLite file.
+
+    About one write in ``1 / PRUNE_PROBABILITY`` also prunes expired rows,
+    then the ones closest to expiry beyond ``max_entries``.
+    """
+
+    PRUNE_PROBABILITY = 0.01
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS data_cache ("
+        "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS ix_data_cache_expires ON data_cache (expires)",
+        "CREATE TABLE IF NOT EXISTS data_cache_tags ("
+        "tag TEXT PRIMARY KEY, version INTEGER NOT NULL)",
+    )
+
+    def __init__(self, path, max_entries):
+        super().__init__(path)
+        self.max_entries = max_entries
+
+    def get(self, key):
+        row = self._connect().execute(
+            "SELECT value FROM data_cache WHERE key = ? AND expires > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key, data, ttl):
+        now = time.time()
+        with self.transaction() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO data_cache (key, value, expires) VALUES (?, ?, ?)",
+                (key, data, now + ttl),
+            )
+            if random.random() < self.PRUNE_PROBABILITY:
+                connection.execute("DELETE FROM data_cache WHERE expires <= ?", (now,))
+                connection.execute(
+                    "DELETE FROM data_cache WHERE key IN (SELECT key FROM data_cache "
+                    "ORDER BY expires DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+
+    def tag_versions(self, tags):
+        tags = list(tags)
+        placeholders = ", ".join("?" for _ in tags)
+        rows = self._connect().execute(
+            f"SELECT tag, version FROM data_cache_tags WHERE tag IN ({placeholders})", tags
+        ).fetchall()
+        versions = dict.fromkeys(tags, 0)
+        versions.update(rows)
+        return versions
+
+    def bump(self, tags):
+        with self.transaction() as connection:
+            connection.executemany(
+                "INSERT INTO data_cache_tags (tag, version) VALUES (?, 1) "
+                "ON CONFLICT (tag) DO UPDATE SET version = version + 1",
+                [(tag,) for tag in tags],
+            )
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.data = None
+
+
+class DataCache:
+    """Read-through cache whose entries are invalidated by tag.
+
+    A value is stored under its key plus the current version of each of its
+    tags; bumping a tag makes every entry carrying it unreachable, and those
+    entries then age out of the backend. Concurrent misses on one key in a
+    process share a single load: the first caller runs the loader and the
+    others wait up to ``wait_timeout`` seconds for its result.
+
+    Values are pickled, so every hit returns fresh, detached copies; only
+    attributes loaded before caching may be used on cached ORM instances.
+    """
+
+    def __init__(self, backend, ttl, wait_timeout):
+        self.backend = backend
+        self.ttl = ttl
+        self.wait_timeout = wait_timeout
+        self.lock = threading.Lock()
+        self.flights = {}
+
+    def get_or_load(self, key, tags, loader):
+        versions = self.backend.tag_versions(tags)
+        full_key = repr((key, sorted(versions.items())))
+        data = self.backend.get(full_key)
+        if data is not None:
+            return pickle.loads(data)
+
+        with self.lock:
+            flight = self.flights.get(full_key)
+            leader = flight is None
+            if leader:
+                flight = self.flights[full_key] = _Flight()
+        if not leader:
+            if flight.done.wait(self.wait_timeout) and flight.data is not None:
+                return pickle.loads(flight.data)
+            return loader()
+
+        try:
+            value = loader()
+            if value is not None:
+                flight.data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+                self.backend.set(full_key, flight.data, self.ttl)
+            return value
+        finally:
+            with self.lock:
+                self.flights.pop(full_key, None)
+            flight.done.set()
+
+    def invalidate(self, tags):
+        if tags:
+            self.backend.bump(tags)
+
+
+def data_cache(app=None):
+    app = app or current_app
+    return app.extensions.get("data_cache")
+
+
+def cached(key, tags, loader):
+    """Return ``loader()``, served from the data cache when it is enabled.
+
+    ``None`` results are never stored.
+    """
+    cache = data_cache()
+    if cache is None:
+        return loader()
+    return cache.get_or_load(key, tags, loader)
+
+
+def invalidate(*tags):
+    """Invalidate ``tags`` once the current transaction commits.
+
+    Bumping after the commit keeps a concurrent request from caching the
+    pre-commit rows under the new tag versions.
+    """
+    db.session.info.setdefault("data_cache_tags", set()).update(tags)
+
+
+def _apply_invalidations(session):
+    tags = session.info.pop("data_cache_tags", None)
+    if not tags or not has_app_context():
+        return
+    cache = data_cache()
+    if cache is not None:
+        cache.invalidate(tags)
+
+
+def _discard_invalidations(session):
+    session.info.pop("data_cache_tags", None)
+
+
+def init_data_cache(app):
+    config = app.config
+    backend_name = config.get("DATA_CACHE_BACKEND")
+    if backend_name == "sqlite":
+        backend = SQLiteCache(config["DATA_CACHE_STORAGE"], config["DATA_CACHE_MAX_ENTRIES"])
+    elif backend_name == "memory":
+        backend = MemoryCache(config["DATA_CACHE_MAX_ENTRIES"])
+    else:
+        return
+    app.extensions["data_cache"] = DataCache(
+        backend, config["DATA_CACHE_TTL"], config["DATA_CACHE_WAIT_TIMEOUT"]
+    )
+    if not event.contains(Session, "after_commit", _apply_invalidations):
+        event.listen(Session, "after_commit", _apply_invalidations)
+        event.listen(Session, "after_rollback", _discard_invalidations)
@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from .extensions import db
+from .jobs import run_worker
+from .models import NotificationType
+from .search import rebuild_club_search
+from .utils import (
+    archive_notification_batch,
+    recount_event_registrations,
+    recount_unread_notifications,
+)
+
+
+clubs_cli = AppGroup("clubs", help="Club maintenance commands.")
+events_cli = AppGroup("events", help="Event maintenance commands.")
+jobs_cli = AppGroup("jobs", help="Background job queue commands.")
+notifications_cli = AppGroup("notifications", help="Notification maintenance commands.")
+
+
+@clubs_cli.command("reindex")
+def reindex_command():
+    """Rebuild the club full-text search index."""
+    indexed = rebuild_club_search()
+    db.session.commit()
+    click.echo(f"Indexed {indexed} club(s).")
+
+
+@events_cli.command("recount")
+def recount_command():
+    """Recompute Event.registered_count from event_registrations."""
+    fixed = recount_event_registrations()
+    db.session.commit()
+    click.echo(f"Updated registration counters on {fixed} event(s).")
+
+
+@notifications_cli.command("recount")
+def recount_unread_command():
+    """Recompute User.unread_notifications from notifications."""
+    fixed = recount_unread_notifications()
+    db.session.commit()
+    click.echo(f"Updated unread counters on {fixed} user(s).")
+
+
+@notifications_cli.command("archive")
+@click.option("--batch-size", type=int, help="Rows moved per transaction.")
+def archive_command(batch_size):
+    """Move read notifications past their retention period to the archive table."""
+    config = current_app.config
+    batch_size = batch_size or config["NOTIFICATION_ARCHIVE_BATCH_SIZE"]
+    now = datetime.utcnow()
+    for ntype in NotificationType:
+        days = config["NOTIFICATION_RETENTION_DAYS"].get(ntype.value)
+        if days is None:
+            continue
+        cutoff = now - timedelta(days=days)
+        total = 0
+        while True:
+            moved = archive_notification_batch(ntype, cutoff, batch_size)
+            db.session.commit()
+            total += moved
+            if moved < batch_size:
+                break
+        click.echo(f"{ntype.value}: archived {total} notification(s).")
+
+
+@jobs_cli.command("worker")
+@click.option("--threads", type=int, help="Worker threads (default: JOBS_WORKER_THREADS).")
+@click.option("--poll-interval", type=float, help="Seconds to sleep when the queue is empty.")
+@click.option("--batch-size", type=int, help="Jobs claimed per poll.")
+@click.option("--once", is_flag=True, help="Exit once the queue is drained.")
+def worker_command(threads, poll_interval, batch_size, once):
+    """Drain the jobs table with a thread pool."""
+    config = current_app.config
+    threads = threads or config["JOBS_WORKER_THREADS"]
+    click.echo(f"Job worker started with {threads} thread(s).")
+    run_worker(
+        current_app._get_current_object(),
+        threads=threads,
+        poll_interval=poll_interval or config["JOBS_POLL_INTERVAL"],
+        batch_size=batch_size or config["JOBS_BATCH_SIZE"],
+        once=once,
+    )
+
+
+def register_commands(app):
+    app.cli.add_command(clubs_cli)
+    app.cli.add_command(events_cli)
+    app.cli.add_command(jobs_cli)
+    app.cli.add_command(notifications_cli)
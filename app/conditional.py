@@ -0,0 +1,93 @@
+import hashlib
+import time
+from datetime import datetime
+from functools import wraps
+
+from flask import current_app, g, make_response, request, session
+from flask_login import current_user
+from sqlalchemy import select
+from sqlalchemy.orm.attributes import set_committed_value
+from werkzeug.http import is_resource_modified
+
+from .extensions import db
+from .models import User
+
+
+def _viewer_state():
+    """Parts of a page that depend on who is looking rather than on the data."""
+    state = [current_user.get_id(), session.get("csrf_token")]
+    # A revalidated page keeps serving the CSRF token it was rendered with;
+    # roll the validator over at half the token lifetime so it never expires.
+    time_limit = current_app.config.get("WTF_CSRF_TIME_LIMIT", 3600)
+    if current_app.config.get("WTF_CSRF_ENABLED", True) and time_limit:
+        state.append(int(time.time() // (time_limit / 2)))
+    return state
+
+
+def _validators(row):
+    parts = [*row, *_viewer_state()]
+    etag = hashlib.sha1(repr(parts).encode()).hexdigest()
+    timestamps = [value for value in row if isinstance(value, datetime)]
+    return etag, max(timestamps, default=None)
+
+
+def page_version():
+    """The version row of the current ``@conditional`` view, without the unread counter.
+
+    ``None`` when the row was missing or the view is not conditional. Views
+    fold it into their data cache keys, so a cached value is never older than
+    the validator sent with it.
+    """
+    return g.get("page_version")
+
+
+def conditional(version):
+    """Answer a repeat GET or HEAD with 304 while the page's inputs are unchanged.
+
+    ``version(**view_args)`` returns a select of the columns the page renders
+    from (timestamps, counters, the viewer's own rows). It runs as one
+    statement, together with the viewer's unread counter, before the view;
+    a row of ``None`` lets the view handle the miss (usually with a 404).
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapped(*args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return view(*args, **kwargs)
+            statement = version(*args, **kwargs)
+            user = current_user._get_current_object()
+            if isinstance(user, User):
+                statement = statement.add_columns(
+                    select(User.unread_notifications).where(User.id == user.id).scalar_subquery()
+                )
+            row = db.session.execute(statement).one_or_none()
+            g.page_version = (
+                None if row is None else tuple(row[:-1] if isinstance(user, User) else row)
+            )
+            # Flashed messages are only consumed by rendering the page.
+            if row is None or session.get("_flashes"):
+                return view(*args, **kwargs)
+            if isinstance(user, User):
+                # The badge renders the counter the validator was built from,
+                # even if this worker's cached identity has not caught up yet.
+                set_committed_value(user, "unread_notifications", row[-1])
+
+            etag, last_modified = _validators(row)
+            if is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            else:
+                response = current_app.response_class(status=304)
+            response.set_etag(etag, weak=True)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            response.vary.add("Cookie")
+            return response
+
+        return wrapped
+
+    return decorator
@@ -0,0 +1,172 @@
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, joinedload, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from .extensions import db
+from .models import Club, ClubManager, User
+
+
+IDENTITY_MODELS = {"user": User, "manager": ClubManager}
+
+
+def _snapshot(instance):
+    state = inspect(instance)
+    return {
+        attr.key: state.dict[attr.key]
+        for attr in state.mapper.column_attrs
+        if attr.key in state.dict
+    }
+
+
+def _restore(model, values):
+    """Attach a copy of a cached row to the current session without a SELECT."""
+    instance = model(**values)
+    make_transient_to_detached(instance)
+    return db.session.merge(instance, load=False)
+
+
+class IdentityCache:
+    """Bounded LRU of ``user:<id>`` / ``manager:<id>`` snapshots with a TTL.
+
+    Invalidation only reaches the process that made the change, so the TTL is
+    the upper bound on how long another worker keeps serving a stale identity.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+
+    def get(self, key):
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, snapshot):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, snapshot)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, keys, club_ids=()):
+        with self.lock:
+            for key in keys:
+                self.entries.pop(key, None)
+            if not club_ids:
+                return
+            for key, (_, snapshot) in list(self.entries.items()):
+                club = snapshot.get("club")
+                if club and club["id"] in club_ids:
+                    del self.entries[key]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+def identity_cache(app=None):
+    app = app or current_app
+    return app.extensions.get("identity_cache")
+
+
+def _load(model, identity):
+    if model is ClubManager:
+        return db.session.get(model, identity, options=[joinedload(ClubManager.club)])
+    return db.session.get(model, identity)
+
+
+def load_identity(user_id):
+    prefix, _, raw_id = (user_id or "").partition(":")
+    model = IDENTITY_MODELS.get(prefix)
+    if model is None or not raw_id.isdigit():
+        return None
+
+    cache = identity_cache()
+    snapshot = cache.get(user_id) if cache else None
+    if snapshot is not None:
+        instance = _restore(model, snapshot["values"])
+        if "club" in snapshot:
+            club = _restore(Club, snapshot["club"]) if snapshot["club"] else None
+            set_committed_value(instance, "club", club)
+            if club is not None:
+                set_committed_value(club, "manager", instance)
+        return instance
+
+    instance = _load(model, int(raw_id))
+    if instance is not None and cache is not None:
+        snapshot = {"values": _snapshot(instance)}
+        if model is ClubManager:
+            snapshot["club"] = _snapshot(instance.club) if instance.club else None
+        cache.put(user_id, snapshot)
+    return instance
+
+
+def _changed(instance):
+    state = inspect(instance)
+    return any(
+        state.attrs[attr.key].history.has_changes() for attr in state.mapper.column_attrs
+    )
+
+
+def _pending_invalidations(session):
+    return session.info.setdefault("identity_invalidations", (set(), set()))
+
+
+def invalidate_identities(keys):
+    """Drop ``keys`` from the identity cache once the current transaction commits.
+
+    For bulk UPDATEs that bypass the ORM, which the flush hook cannot see.
+    """
+    _pending_invalidations(db.session)[0].update(keys)
+
+
+def _collect_invalidations(session, flush_context):
+    keys, club_ids = _pending_invalidations(session)
+    for instance in session.deleted:
+        if isinstance(instance, (User, ClubManager)):
+            keys.add(instance.get_id())
+        elif isinstance(instance, Club):
+            club_ids.add(instance.id)
+    for instance in session.dirty:
+        if isinstance(instance, (User, ClubManager)) and _changed(instance):
+            keys.add(instance.get_id())
+        elif isinstance(instance, Club) and _changed(instance):
+            club_ids.add(instance.id)
+
+
+def _apply_invalidations(session):
+    keys, club_ids = session.info.pop("identity_invalidations", (set(), set()))
+    if not (keys or club_ids) or not has_app_context():
+        return
+    cache = identity_cache()
+    if cache is not None:
+        cache.invalidate(keys, club_ids)
+
+
+def _discard_invalidations(session):
+    session.info.pop("identity_invalidations", None)
+
+
+def init_identity_cache(app):
+    ttl = app.config.get("IDENTITY_CACHE_TTL")
+    if not ttl:
+        return
+    app.extensions["identity_cache"] = IdentityCache(app.config["IDENTITY_CACHE_SIZE"], ttl)
+    if not event.contains(Session, "after_flush", _collect_invalidations):
+        event.listen(Session, "after_flush", _collect_invalidations)
+        event.listen(Session, "after_commit", _apply_invalidations)
+        event.listen(Session, "after_rollback", _discard_invalidations)
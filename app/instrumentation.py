@@ -0,0 +1,219 @@
+import logging
+import re
+import time
+from collections import Counter
+
+from blinker import Namespace
+from flask import (
+    before_render_template,
+    current_app,
+    g,
+    has_app_context,
+    has_request_context,
+    request,
+    template_rendered,
+)
+from sqlalchemy import event
+
+from .extensions import db
+
+
+_signals = Namespace()
+query_stats_recorded = _signals.signal("query-stats-recorded")
+
+# EXPLAIN runs on the caller's connection, inside its transaction; on
+# PostgreSQL a failing EXPLAIN would abort that transaction, so only reads
+# are explained.
+EXPLAINABLE = ("SELECT", "WITH")
+
+_IN_LIST = re.compile(r"\(\?(?:,\s*\?)+\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement):
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    return _IN_LIST.sub("(?...)", shape)
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+
+    def record(self, statement, duration):
+        self.count += 1
+        self.duration += duration
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold):
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+
+def current_query_stats():
+    if not has_request_context():
+        return None
+    return g.get("query_stats")
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context rather than on the connection, so a
+    # statement that raises leaves no start time behind for the next one.
+    if context is not None:
+        context.query_start = time.perf_counter()
+
+
+def explain_statement(cursor, dialect, statement, parameters):
+    if not statement.lstrip().upper().startswith(EXPLAINABLE):
+        return []
+    sqlite = dialect.name == "sqlite"
+    prefix = "EXPLAIN QUERY PLAN " if sqlite else "EXPLAIN "
+    explain = cursor.connection.cursor()
+    try:
+        explain.execute(prefix + statement, parameters)
+        rows = explain.fetchall()
+    finally:
+        explain.close()
+    return [row[3] if sqlite else row[0] for row in rows]
+
+
+def describe_parameters(parameters):
+    """Count and types of bound parameters; the values may be password hashes
+    or personal data and stay out of the log."""
+    if isinstance(parameters, dict):
+        names = ", ".join(f"{key}: {type(value).__name__}" for key, value in parameters.items())
+        return f"{len(parameters)} ({names})"
+    values = list(parameters or ())
+    return f"{len(values)} ({', '.join(type(value).__name__ for value in values)})"
+
+
+def slow_query_logger(app):
+    return logging.getLogger(f"{app.logger.name}.slow_query")
+
+
+def _log_slow_query(conn, cursor, statement, parameters, elapsed):
+    try:
+        plan = explain_statement(cursor, conn.dialect, statement, parameters)
+    except Exception as exc:
+        plan = [f"unavailable: {exc!r}"]
+    endpoint = request.endpoint if has_request_context() else None
+    slow_query_logger(current_app).warning(
+        "Slow query (%.1f ms) endpoint=%s\n%s\nparameters=%s\nplan:\n  %s",
+        elapsed * 1000,
+        endpoint or "-",
+        statement,
+        describe_parameters(parameters),
+        "\n  ".join(plan) or "-",
+    )
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "query_start", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    stats = current_query_stats()
+    if stats is not None:
+        stats.record(statement, elapsed)
+    if executemany or not has_app_context():
+        return
+    threshold = current_app.config.get("SLOW_QUERY_THRESHOLD_MS")
+    if threshold is not None and elapsed * 1000 >= threshold:
+        _log_slow_query(conn, cursor, statement, parameters, elapsed)
+
+
+def _template_started(sender, template, context, **extra):
+    if has_request_context():
+        g.template_starts.append(time.perf_counter())
+
+
+def _template_finished(sender, template, context, **extra):
+    if not has_request_context() or not g.template_starts:
+        return
+    started = g.template_starts.pop()
+    if not g.template_starts:
+        g.template_time += time.perf_counter() - started
+
+
+def _start_request_stats():
+    g.query_stats = QueryStats()
+    g.request_started = time.perf_counter()
+    g.template_starts = []
+    g.template_time = 0.0
+
+
+def _report_query_stats(response):
+    # Missing when an earlier before_request (e.g. CSRF) answered the request.
+    stats = g.get("query_stats")
+    if stats is None:
+        return response
+    endpoint = request.endpoint or request.path
+    budget = current_app.config.get("QUERY_BUDGET")
+    if budget and stats.count > budget:
+        current_app.logger.warning(
+            "%s ran %d queries (budget %d) in %.1f ms",
+            endpoint,
+            stats.count,
+            budget,
+            stats.duration * 1000,
+        )
+    threshold = current_app.config.get("QUERY_REPEAT_THRESHOLD", 5)
+    for shape, count in stats.repeated(threshold):
+        current_app.logger.warning("%s repeated a statement %d times: %s", endpoint, count, shape)
+    query_stats_recorded.send(current_app._get_current_object(), endpoint=endpoint, stats=stats)
+    return response
+
+
+def server_timing_header(db_time, query_count, template_time, view_time):
+    return ", ".join(
+        [
+            f'db;dur={db_time * 1000:.1f};desc="{query_count} queries"',
+            f"tpl;dur={template_time * 1000:.1f}",
+            f"view;dur={view_time * 1000:.1f}",
+        ]
+    )
+
+
+def _add_server_timing(response):
+    started = g.get("request_started")
+    stats = g.get("query_stats")
+    if started is None or stats is None:
+        return response
+    view_time = time.perf_counter() - started
+    response.headers["Server-Timing"] = server_timing_header(
+        stats.duration, stats.count, g.template_time, view_time
+    )
+    if current_app.config.get("SERVER_TIMING_LOG"):
+        current_app.logger.info(
+            "timing endpoint=%s status=%d db_ms=%.1f queries=%d tpl_ms=%.1f view_ms=%.1f",
+            request.endpoint or request.path,
+            response.status_code,
+            stats.duration * 1000,
+            stats.count,
+            g.template_time * 1000,
+            view_time * 1000,
+        )
+    return response
+
+
+def init_instrumentation(app):
+    query_stats = app.config.get("QUERY_INSTRUMENTATION")
+    server_timing = app.config.get("SERVER_TIMING")
+    slow_queries = app.config.get("SLOW_QUERY_THRESHOLD_MS") is not None
+    if not (query_stats or server_timing or slow_queries):
+        return
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    if not (query_stats or server_timing):
+        return
+
+    app.before_request(_start_request_stats)
+    if query_stats:
+        app.after_request(_report_query_stats)
+    if server_timing:
+        before_render_template.connect(_template_started, app)
+        template_rendered.connect(_template_finished, app)
+        app.after_request(_add_server_timing)
@@ -0,0 +1,127 @@
+import enum
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from functools import wraps
+
+from flask import current_app
+from sqlalchemy import and_, delete, or_, select, update
+
+from . import models
+from .extensions import db
+from .models import Job, JobStatus
+
+
+TASKS = {}
+
+
+def _encode(value):
+    if isinstance(value, enum.Enum):
+        return {"__enum__": type(value).__name__, "value": value.value}
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__} into a job payload")
+
+
+def _decode(value):
+    if "__enum__" in value:
+        return getattr(models, value["__enum__"])(value["value"])
+    if "__datetime__" in value:
+        return datetime.fromisoformat(value["__datetime__"])
+    return value
+
+
+def enqueue(name, *args, **kwargs):
+    job = Job(
+        name=name,
+        payload=json.dumps({"args": args, "kwargs": kwargs}, default=_encode),
+    )
+    db.session.add(job)
+    return job
+
+
+def deferrable(name, timestamp=None):
+    def decorator(fn):
+        TASKS[name] = fn
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not current_app.config.get("JOBS_DEFER_SIDE_EFFECTS"):
+                return fn(*args, **kwargs)
+            if timestamp and kwargs.get(timestamp) is None:
+                kwargs[timestamp] = datetime.utcnow()
+            return enqueue(name, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _claimable(now):
+    lease_cutoff = now - timedelta(seconds=current_app.config.get("JOBS_LEASE_SECONDS", 300))
+    return or_(
+        and_(Job.status == JobStatus.PENDING, Job.run_after <= now),
+        and_(Job.status == JobStatus.RUNNING, Job.started_at < lease_cutoff),
+    )
+
+
+def claim_jobs(limit):
+    now = datetime.utcnow()
+    candidates = db.session.scalars(
+        select(Job.id).where(_claimable(now)).order_by(Job.run_after, Job.id).limit(limit)
+    ).all()
+    claimed = []
+    for job_id in candidates:
+        result = db.session.execute(
+            update(Job)
+            .where(Job.id == job_id, _claimable(now))
+            .values(status=JobStatus.RUNNING, started_at=now, attempts=Job.attempts + 1)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            claimed.append(job_id)
+    db.session.commit()
+    return claimed
+
+
+def run_job(job_id):
+    job = db.session.get(Job, job_id)
+    if job is None:
+        return
+    try:
+        payload = json.loads(job.payload, object_hook=_decode)
+        TASKS[job.name](*payload["args"], **payload["kwargs"])
+        db.session.execute(delete(Job).where(Job.id == job_id))
+        db.session.commit()
+    except Exception as exc:
+        db.session.rollback()
+        current_app.logger.exception("Job %s (%s) failed", job_id, job.name)
+        job = db.session.get(Job, job_id)
+        job.last_error = repr(exc)
+        if job.attempts >= current_app.config.get("JOBS_MAX_ATTEMPTS", 5):
+            job.status = JobStatus.FAILED
+        else:
+            job.status = JobStatus.PENDING
+            job.run_after = datetime.utcnow() + timedelta(seconds=2 ** job.attempts)
+        db.session.commit()
+
+
+def _run_in_context(app, job_id):
+    with app.app_context():
+        run_job(job_id)
+
+
+def run_worker(app, threads, poll_interval, batch_size, once=False):
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        while True:
+            with app.app_context():
+                job_ids = claim_jobs(batch_size)
+            if job_ids:
+                list(pool.map(lambda job_id: _run_in_context(app, job_id), job_ids))
+                continue
+            if once:
+                return
+            time.sleep(poll_interval)
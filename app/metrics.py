@@ -0,0 +1,236 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from flask import current_app, g, request, request_started
+from sqlalchemy import event, func, select
+
+from .extensions import db
+from .models import Job, JobStatus
+
+
+class MetricsRegistry:
+    """Per-process request and pool counters.
+
+    Each worker periodically writes a snapshot to ``METRICS_DIR``; a scrape
+    merges the snapshots of every worker so the totals cover the whole pool.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.lock = threading.Lock()
+        self.requests = defaultdict(int)
+        self.latency = {}
+        self.pool_checkouts = 0
+        self.pool_checked_out = 0
+        self.last_flush = 0.0
+
+    def observe(self, endpoint, method, status, seconds):
+        with self.lock:
+            self.requests[(endpoint, method, str(status))] += 1
+            series = self.latency.get(endpoint)
+            if series is None:
+                series = self.latency[endpoint] = {
+                    "buckets": [0] * len(self.buckets),
+                    "sum": 0.0,
+                    "count": 0,
+                }
+            for index, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    series["buckets"][index] += 1
+                    break
+            series["sum"] += seconds
+            series["count"] += 1
+
+    def checkout(self):
+        with self.lock:
+            self.pool_checkouts += 1
+            self.pool_checked_out += 1
+
+    def checkin(self):
+        with self.lock:
+            self.pool_checked_out -= 1
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "pid": os.getpid(),
+                "requests": [[*key, count] for key, count in self.requests.items()],
+                "latency": {
+                    endpoint: {**series, "buckets": list(series["buckets"])}
+                    for endpoint, series in self.latency.items()
+                },
+                "pool_checkouts": self.pool_checkouts,
+                "pool_checked_out": self.pool_checked_out,
+            }
+
+    def flush(self, directory):
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        target = directory / f"{os.getpid()}.json"
+        temporary = target.with_suffix(".tmp")
+        temporary.write_text(json.dumps(self.snapshot()))
+        os.replace(temporary, target)
+        self.last_flush = time.monotonic()
+
+
+def _process_alive(pid):
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def collect_snapshots(registry, directory):
+    if not directory:
+        return [registry.snapshot()]
+    registry.flush(directory)
+    snapshots = []
+    for path in sorted(Path(directory).glob("*.json")):
+        try:
+            snapshots.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            continue
+    return snapshots
+
+
+def _merge(snapshots, bucket_count):
+    requests = defaultdict(int)
+    latency = {}
+    checkouts = 0
+    checked_out = 0
+    for snapshot in snapshots:
+        for endpoint, method, status, count in snapshot["requests"]:
+            requests[(endpoint, method, status)] += count
+        for endpoint, series in snapshot["latency"].items():
+            merged = latency.setdefault(
+                endpoint, {"buckets": [0] * bucket_count, "sum": 0.0, "count": 0}
+            )
+            for index, count in enumerate(series["buckets"][:bucket_count]):
+                merged["buckets"][index] += count
+            merged["sum"] += series["sum"]
+            merged["count"] += series["count"]
+        checkouts += snapshot["pool_checkouts"]
+        if _process_alive(snapshot["pid"]):
+            checked_out += snapshot["pool_checked_out"]
+    return requests, latency, checkouts, checked_out
+
+
+def _labels(**labels):
+    pairs = ",".join(
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+        for name, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+def _format_bound(bound):
+    return "+Inf" if bound == float("inf") else repr(float(bound))
+
+
+def job_queue_depth():
+    rows = db.session.execute(select(Job.status, func.count()).group_by(Job.status)).all()
+    depth = {status: 0 for status in JobStatus}
+    depth.update(dict(rows))
+    return depth
+
+
+def render_metrics(app):
+    registry = app.extensions["metrics"]
+    snapshots = collect_snapshots(registry, app.config.get("METRICS_DIR"))
+    requests, latency, checkouts, checked_out = _merge(snapshots, len(registry.buckets))
+
+    lines = [
+        "# HELP http_requests_total Requests handled, by endpoint, method and status.",
+        "# TYPE http_requests_total counter",
+    ]
+    for (endpoint, method, status), count in sorted(requests.items()):
+        labels = _labels(endpoint=endpoint, method=method, status=status)
+        lines.append(f"http_requests_total{labels} {count}")
+
+    lines += [
+        "# HELP http_request_duration_seconds Request latency, by endpoint.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    for endpoint, series in sorted(latency.items()):
+        cumulative = 0
+        for bound, count in zip(registry.buckets, series["buckets"]):
+            cumulative += count
+            labels = _labels(endpoint=endpoint, le=_format_bound(bound))
+            lines.append(f"http_request_duration_seconds_bucket{labels} {cumulative}")
+        labels = _labels(endpoint=endpoint, le="+Inf")
+        lines.append(f"http_request_duration_seconds_bucket{labels} {series['count']}")
+        labels = _labels(endpoint=endpoint)
+        lines.append(f"http_request_duration_seconds_sum{labels} {series['sum']:.6f}")
+        lines.append(f"http_request_duration_seconds_count{labels} {series['count']}")
+
+    engine_pool = db.engine.pool
+    lines += [
+        "# HELP db_pool_checkouts_total Connections checked out of the pool.",
+        "# TYPE db_pool_checkouts_total counter",
+        f"db_pool_checkouts_total {checkouts}",
+        "# HELP db_pool_checked_out Connections currently checked out, across workers.",
+        "# TYPE db_pool_checked_out gauge",
+        f"db_pool_checked_out {checked_out}",
+    ]
+    if hasattr(engine_pool, "size"):
+        lines += [
+            "# HELP db_pool_size Configured pool size per worker.",
+            "# TYPE db_pool_size gauge",
+            f"db_pool_size {engine_pool.size()}",
+        ]
+
+    lines += [
+        "# HELP jobs_queue_depth Jobs in the queue, by status.",
+        "# TYPE jobs_queue_depth gauge",
+    ]
+    for status, count in job_queue_depth().items():
+        lines.append(f"jobs_queue_depth{_labels(status=status.value)} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def _start_timer(sender, **extra):
+    g.metrics_started = time.perf_counter()
+
+
+def _record_request(response):
+    started = g.get("metrics_started")
+    if started is None:
+        return response
+    app = current_app._get_current_object()
+    registry = app.extensions["metrics"]
+    registry.observe(
+        request.endpoint or "unmatched",
+        request.method,
+        response.status_code,
+        time.perf_counter() - started,
+    )
+    directory = app.config.get("METRICS_DIR")
+    interval = app.config.get("METRICS_FLUSH_INTERVAL", 5)
+    if directory and time.monotonic() - registry.last_flush >= interval:
+        registry.flush(directory)
+    return response
+
+
+def init_metrics(app):
+    if not app.config.get("METRICS_ENABLED"):
+        return
+
+    registry = MetricsRegistry(app.config["METRICS_LATENCY_BUCKETS"])
+    app.extensions["metrics"] = registry
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "checkout", lambda *args: registry.checkout())
+    event.listen(engine, "checkin", lambda *args: registry.checkin())
+    # The signal fires before any before_request hook, so requests those
+    # hooks abort (a CSRF failure, say) are still timed and counted.
+    request_started.connect(_start_timer, app)
+    app.after_request(_record_request)
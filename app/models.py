@@ -2,6 +2,7 @@ import enum
 from datetime import datetime
 
 from flask_login import UserMixin
+from sqlalchemy import DDL, event
 
 from .extensions import db
 
@@ -46,6 +47,7 @@ class EventStatus(enum.Enum):
 
 class EventRegistrationStatus(enum.Enum):
     REGISTERED = "REGISTERED"
+    WAITLISTED = "WAITLISTED"
     CANCELLED = "CANCELLED"
 
 
@@ -58,6 +60,12 @@ class NotificationType(enum.Enum):
     FOUNDER_RESPONSE = "FOUNDER_RESPONSE"
 
 
+class JobStatus(enum.Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    FAILED = "FAILED"
+
+
 class AuditActorType(enum.Enum):
     USER_ADMIN = "USER_ADMIN"
     CLUB_MANAGER = "CLUB_MANAGER"
@@ -74,6 +82,9 @@ class User(UserMixin, db.Model):
     email = db.Column(db.String(255), unique=True, nullable=False)
     password_hash = db.Column(db.String(255), nullable=False)
     is_active = db.Column(db.Boolean, default=True)
+    unread_notifications = db.Column(
+        db.Integer, nullable=False, default=0, server_default="0"
+    )
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(
         db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
@@ -129,6 +140,22 @@ class Club(db.Model):
     )
     events = db.relationship("Event", back_populates="club", lazy="dynamic")
 
+    __table_args__ = (db.Index("ix_clubs_status_name", "status", "name"),)
+
+
+event.listen(
+    Club.__table__,
+    "after_create",
+    DDL(
+        "CREATE VIRTUAL TABLE club_search USING fts5(name, category, description)"
+    ).execute_if(dialect="sqlite"),
+)
+event.listen(
+    Club.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS club_search").execute_if(dialect="sqlite"),
+)
+
 
 class ClubManager(UserMixin, db.Model):
     __tablename__ = "club_managers"
@@ -173,6 +200,12 @@ class ClubApplication(db.Model):
         "ClubFounderInvitation", back_populates="club_application", lazy="dynamic"
     )
 
+    __table_args__ = (
+        db.Index("ix_club_applications_status_created", "status", "created_at"),
+        db.Index("ix_club_applications_status_decided", "status", "decided_at"),
+        db.Index("ix_club_applications_applicant_status", "applicant_user_id", "status"),
+    )
+
 
 class ClubFounderInvitation(db.Model):
     __tablename__ = "club_founder_invitations"
@@ -188,6 +221,15 @@ class ClubFounderInvitation(db.Model):
     club_application = db.relationship("ClubApplication", back_populates="founders")
     invited_student = db.relationship("User")
 
+    __table_args__ = (
+        db.Index(
+            "ix_club_founder_invitations_application_student",
+            "club_application_id",
+            "invited_student_id",
+        ),
+        db.Index("ix_club_founder_invitations_student", "invited_student_id"),
+    )
+
 
 class Membership(db.Model):
     __tablename__ = "memberships"
@@ -203,6 +245,8 @@ class Membership(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint("club_id", "user_id", name="uniq_membership"),
+        db.Index("ix_memberships_user_active", "user_id", "is_active"),
+        db.Index("ix_memberships_club_active", "club_id", "is_active"),
     )
 
 
@@ -227,6 +271,16 @@ class MembershipApplication(db.Model):
     user = db.relationship("User", back_populates="membership_applications")
     decided_by_manager = db.relationship("ClubManager")
 
+    __table_args__ = (
+        db.Index(
+            "ix_membership_applications_club_status_created",
+            "club_id",
+            "status",
+            "created_at",
+        ),
+        db.Index("ix_membership_applications_user_created", "user_id", "created_at"),
+    )
+
 
 class Announcement(db.Model):
     __tablename__ = "announcements"
@@ -241,6 +295,10 @@ class Announcement(db.Model):
     club = db.relationship("Club", back_populates="announcements")
     created_by_manager = db.relationship("ClubManager")
 
+    __table_args__ = (
+        db.Index("ix_announcements_club_created", "club_id", "created_at"),
+    )
+
 
 class Event(db.Model):
     __tablename__ = "events"
@@ -253,6 +311,7 @@ class Event(db.Model):
     start_datetime = db.Column(db.DateTime, nullable=False)
     end_datetime = db.Column(db.DateTime, nullable=False)
     capacity = db.Column(db.Integer)
+    registered_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
     registration_deadline = db.Column(db.DateTime)
     status = db.Column(db.Enum(EventStatus), nullable=False, default=EventStatus.PENDING_APPROVAL)
     created_by_manager_id = db.Column(db.Integer, db.ForeignKey("club_managers.id"))
@@ -268,11 +327,16 @@ class Event(db.Model):
         "EventRegistration", back_populates="event", lazy="dynamic"
     )
 
+    __table_args__ = (
+        db.Index("ix_events_status_start", "status", "start_datetime"),
+        db.Index("ix_events_status_created", "status", "created_at"),
+        db.Index("ix_events_status_decided", "status", "decided_at"),
+        db.Index("ix_events_club_status_start", "club_id", "status", "start_datetime"),
+    )
+
     @property
     def registration_count(self):
-        return (
-            self.registrations.filter_by(status=EventRegistrationStatus.REGISTERED).count()
-        )
+        return self.registered_count or 0
 
     @property
     def is_full(self):
@@ -294,12 +358,19 @@ class EventRegistration(db.Model):
     )
     registered_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     cancelled_at = db.Column(db.DateTime)
+    waitlist_position = db.Column(db.Integer)
 
     event = db.relationship("Event", back_populates="registrations")
     user = db.relationship("User")
 
     __table_args__ = (
         db.UniqueConstraint("event_id", "user_id", name="uniq_event_registration"),
+        db.Index(
+            "ix_event_registrations_event_status_position",
+            "event_id",
+            "status",
+            "waitlist_position",
+        ),
     )
 
 
@@ -318,6 +389,29 @@ class Notification(db.Model):
 
     user = db.relationship("User", back_populates="notifications")
 
+    __table_args__ = (
+        db.Index("ix_notifications_user_created", "user_id", "created_at"),
+        db.Index("ix_notifications_type_read_created", "type", "is_read", "created_at"),
+    )
+
+
+class NotificationArchive(db.Model):
+    __tablename__ = "notification_archive"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    user_id = db.Column(db.Integer, nullable=False)
+    type = db.Column(db.Enum(NotificationType), nullable=False)
+    title = db.Column(db.String(200), nullable=False)
+    body = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    related_object_type = db.Column(db.String(100))
+    related_object_id = db.Column(db.Integer)
+
+    __table_args__ = (
+        db.Index("ix_notification_archive_user_created", "user_id", "created_at"),
+    )
+
 
 class AuditLog(db.Model):
     __tablename__ = "audit_logs"
@@ -330,3 +424,19 @@ class AuditLog(db.Model):
     object_id = db.Column(db.Integer, nullable=False)
     details = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+
+class Job(db.Model):
+    __tablename__ = "jobs"
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    payload = db.Column(db.Text, nullable=False)
+    status = db.Column(db.Enum(JobStatus), nullable=False, default=JobStatus.PENDING)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    run_after = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    started_at = db.Column(db.DateTime)
+    last_error = db.Column(db.Text)
+
+    __table_args__ = (db.Index("ix_jobs_status_run_after", "status", "run_after"),)
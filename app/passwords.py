@@ -0,0 +1,92 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+from werkzeug.exceptions import ServiceUnavailable
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from .extensions import db
+
+
+class HashingBusy(ServiceUnavailable):
+    description = "The server is busy handling logins. Please try again in a moment."
+
+
+class PasswordHasher:
+    """Runs password KDFs on a bounded thread pool.
+
+    ``workers`` caps how many hashes run at once (hashlib releases the GIL, so
+    they do run in parallel) and at most ``queue`` more may wait. A caller that
+    cannot get a slot, or whose job does not start, within ``timeout`` seconds
+    gets a 503 instead of tying up its worker thread behind a login storm.
+    """
+
+    def __init__(self, method, workers, queue, timeout):
+        self.method = method
+        # werkzeug spells out the defaults in the hash ("scrypt" is written as
+        # "scrypt:32768:8:1"), so compare against what it actually writes.
+        self.prefix = generate_password_hash("", method).split("$", 1)[0]
+        self.timeout = timeout
+        self.slots = threading.BoundedSemaphore(workers + queue)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+
+    def _run(self, fn, *args):
+        if not self.slots.acquire(timeout=self.timeout):
+            raise HashingBusy(retry_after=int(self.timeout) or 1)
+        started = threading.Event()
+
+        def job():
+            started.set()
+            return fn(*args)
+
+        try:
+            future = self.executor.submit(job)
+        except BaseException:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+        if not started.wait(self.timeout) and future.cancel():
+            raise HashingBusy(retry_after=int(self.timeout) or 1)
+        return future.result()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        return password_hash.split("$", 1)[0] != self.prefix
+
+
+def password_hasher():
+    return current_app.extensions["password_hasher"]
+
+
+def hash_password(password):
+    return password_hasher().hash(password)
+
+
+def check_password(account, password):
+    """Verify ``password`` against ``account.password_hash``.
+
+    When the stored hash was made with other parameters than
+    ``PASSWORD_HASH_METHOD``, it is replaced on the account and committed.
+    """
+    hasher = password_hasher()
+    if not hasher.verify(account.password_hash, password):
+        return False
+    if hasher.needs_rehash(account.password_hash):
+        account.password_hash = hasher.hash(password)
+        db.session.commit()
+    return True
+
+
+def init_password_hasher(app):
+    config = app.config
+    app.extensions["password_hasher"] = PasswordHasher(
+        config["PASSWORD_HASH_METHOD"],
+        config["PASSWORD_HASH_WORKERS"],
+        config["PASSWORD_HASH_QUEUE"],
+        config["PASSWORD_HASH_TIMEOUT"],
+    )
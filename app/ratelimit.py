@@ -0,0 +1,134 @@
+import random
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+
+from .sqlite_store import LocalSQLiteStore
+
+
+class MemoryBackend:
+    """Per-process store: an LRU of at most ``max_keys`` counters."""
+
+    def __init__(self, max_keys):
+        self.max_keys = max_keys
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+
+    def get(self, key):
+        with self.lock:
+            return self.entries.get(key)
+
+    def update(self, key, apply):
+        with self.lock:
+            state = apply(self.entries.get(key))
+            self.entries[key] = state
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_keys:
+                self.entries.popitem(last=False)
+            return state
+
+
+class SQLiteBackend(LocalSQLiteStore):
+    """Store shared by every worker on the host through one SQLite file.
+
+    About one write in ``1 / PRUNE_PROBABILITY`` also prunes the least
+    recently touched keys beyond ``max_keys``.
+    """
+
+    PRUNE_PROBABILITY = 0.01
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS rate_limits ("
+        "key TEXT PRIMARY KEY, window INTEGER NOT NULL, current INTEGER NOT NULL, "
+        "previous INTEGER NOT NULL, touched REAL NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS ix_rate_limits_touched ON rate_limits (touched)",
+    )
+
+    def __init__(self, path, max_keys):
+        super().__init__(path)
+        self.max_keys = max_keys
+
+    def get(self, key):
+        row = self._connect().execute(
+            "SELECT window, current, previous FROM rate_limits WHERE key = ?", (key,)
+        ).fetchone()
+        return tuple(row) if row else None
+
+    def update(self, key, apply):
+        with self.transaction() as connection:
+            row = connection.execute(
+                "SELECT window, current, previous FROM rate_limits WHERE key = ?", (key,)
+            ).fetchone()
+            state = apply(tuple(row) if row else None)
+            connection.execute(
+                "INSERT INTO rate_limits (key, window, current, previous, touched) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET "
+                "window = excluded.window, current = excluded.current, "
+                "previous = excluded.previous, touched = excluded.touched",
+                (key, *state, time.time()),
+            )
+            if random.random() < self.PRUNE_PROBABILITY:
+                connection.execute(
+                    "DELETE FROM rate_limits WHERE key IN (SELECT key FROM rate_limits "
+                    "ORDER BY touched DESC LIMIT -1 OFFSET ?)",
+                    (self.max_keys,),
+                )
+        return state
+
+
+class RateLimiter:
+    """Sliding-window counter: ``limit`` hits per ``window`` seconds per key.
+
+    Each key keeps three integers (the current window number and the hit counts
+    of the current and previous windows). The previous window's count is
+    weighted by how much of it still overlaps the sliding window, which
+    approximates a true sliding log without storing timestamps.
+    """
+
+    def __init__(self, backend, limit, window):
+        self.backend = backend
+        self.limit = limit
+        self.window = window
+
+    def _roll(self, state, now):
+        index = int(now // self.window)
+        if state is None or state[0] < index - 1:
+            return (index, 0, 0)
+        if state[0] == index - 1:
+            return (index, 0, state[1])
+        return state
+
+    def _estimate(self, state, now):
+        _, current, previous = self._roll(state, now)
+        overlap = 1 - (now % self.window) / self.window
+        return current + previous * overlap
+
+    def blocked(self, key, now=None):
+        now = time.time() if now is None else now
+        state = self.backend.get(key)
+        return state is not None and self._estimate(state, now) >= self.limit
+
+    def hit(self, key, now=None):
+        now = time.time() if now is None else now
+
+        def apply(state):
+            index, current, previous = self._roll(state, now)
+            return (index, current + 1, previous)
+
+        return self.backend.update(key, apply)
+
+
+def login_limiter():
+    return current_app.extensions["login_limiter"]
+
+
+def init_rate_limiter(app):
+    config = app.config
+    if config["RATELIMIT_BACKEND"] == "sqlite":
+        backend = SQLiteBackend(config["RATELIMIT_STORAGE"], config["RATELIMIT_MAX_KEYS"])
+    else:
+        backend = MemoryBackend(config["RATELIMIT_MAX_KEYS"])
+    app.extensions["login_limiter"] = RateLimiter(
+        backend, config["LOGIN_RATE_LIMIT"], config["LOGIN_RATE_WINDOW"]
+    )
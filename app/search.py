@@ -0,0 +1,78 @@
+import re
+
+from sqlalchemy import column, delete, func, insert, literal_column, or_, select, table
+
+from .extensions import db
+from .models import Club
+
+
+club_search = table(
+    "club_search",
+    column("rowid"),
+    column("name"),
+    column("category"),
+    column("description"),
+)
+
+NAME_WEIGHT = 10.0
+CATEGORY_WEIGHT = 5.0
+DESCRIPTION_WEIGHT = 1.0
+
+
+def fts_enabled():
+    return db.session.get_bind().dialect.name == "sqlite"
+
+
+def _match_expression(search):
+    terms = re.findall(r"\w+", search)
+    return " AND ".join(f'"{term}"*' for term in terms)
+
+
+def index_club(club):
+    if not fts_enabled():
+        return
+    db.session.execute(delete(club_search).where(club_search.c.rowid == club.id))
+    db.session.execute(
+        insert(club_search).values(
+            rowid=club.id,
+            name=club.name,
+            category=club.category or "",
+            description=club.description,
+        )
+    )
+
+
+def rebuild_club_search():
+    if not fts_enabled():
+        return 0
+    db.session.execute(delete(club_search))
+    result = db.session.execute(
+        insert(club_search).from_select(
+            ["rowid", "name", "category", "description"],
+            select(Club.id, Club.name, func.coalesce(Club.category, ""), Club.description),
+        )
+    )
+    return result.rowcount
+
+
+def search_clubs(query, search):
+    if not fts_enabled():
+        like = f"%{search}%"
+        return query.filter(
+            or_(Club.name.ilike(like), Club.category.ilike(like), Club.description.ilike(like))
+        ).order_by(Club.name, Club.id)
+
+    expression = _match_expression(search)
+    if not expression:
+        return query.filter(db.false())
+    ranked = (
+        select(
+            club_search.c.rowid.label("club_id"),
+            func.bm25(
+                literal_column("club_search"), NAME_WEIGHT, CATEGORY_WEIGHT, DESCRIPTION_WEIGHT
+            ).label("rank"),
+        )
+        .where(literal_column("club_search").op("MATCH")(expression))
+        .subquery()
+    )
+    return query.join(ranked, ranked.c.club_id == Club.id).order_by(ranked.c.rank, Club.id)
@@ -0,0 +1,47 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+
+class LocalSQLiteStore:
+    """Base for stores kept in one SQLite file shared by every worker on the host.
+
+    Each thread gets its own connection in autocommit mode; writers take
+    ``BEGIN IMMEDIATE`` through :meth:`transaction` so concurrent workers
+    serialize on their read-modify-write. The file and the ``SCHEMA``
+    statements are only created once the first connection is opened, so
+    building the app does not touch the disk.
+    """
+
+    SCHEMA = ()
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.local = threading.local()
+
+    def _connect(self):
+        # A connection opened before gunicorn forks must not be reused by
+        # the workers, hence the pid check.
+        if getattr(self.local, "pid", None) != os.getpid():
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            for statement in self.SCHEMA:
+                connection.execute(statement)
+            self.local.connection = connection
+            self.local.pid = os.getpid()
+        return self.local.connection
+
+    @contextmanager
+    def transaction(self):
+        connection = self._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
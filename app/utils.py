@@ -1,12 +1,52 @@
+import base64
+import binascii
+import json
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 
 from flask import request
+from sqlalchemy import (
+    DateTime,
+    Select,
+    delete,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    tuple_,
+    update,
+)
 
 from .extensions import db
-from .models import Notification, NotificationType, AuditLog, AuditActorType
+from .identity import invalidate_identities
+from .jobs import deferrable
+from .models import (
+    Notification,
+    NotificationArchive,
+    NotificationType,
+    AuditLog,
+    AuditActorType,
+    Event,
+    EventRegistration,
+    EventRegistrationStatus,
+    Membership,
+    User,
+)
 
 
-def create_notification(user_id, ntype, title, body, related_object_type=None, related_object_id=None):
+@deferrable("create_notification", timestamp="created_at")
+def create_notification(
+    user_id,
+    ntype,
+    title,
+    body,
+    related_object_type=None,
+    related_object_id=None,
+    created_at=None,
+):
     note = Notification(
         user_id=user_id,
         type=ntype,
@@ -14,12 +54,173 @@ def create_notification(user_id, ntype, title, body, related_object_type=None, r
         body=body,
         related_object_type=related_object_type,
         related_object_id=related_object_id,
+        created_at=created_at or datetime.utcnow(),
     )
     db.session.add(note)
+    adjust_unread_notifications(User.id == user_id, 1)
     return note
 
 
-def log_audit(actor_type, actor_id, action, object_type, object_id, details=None):
+NOTIFICATION_CHUNK_SIZE = 1000
+
+
+@deferrable("create_notifications", timestamp="created_at")
+def create_notifications(
+    recipients,
+    ntype,
+    title,
+    body,
+    related_object_type=None,
+    related_object_id=None,
+    created_at=None,
+):
+    values = {
+        "type": ntype,
+        "title": title,
+        "body": body,
+        "is_read": False,
+        "created_at": created_at or datetime.utcnow(),
+        "related_object_type": related_object_type,
+        "related_object_id": related_object_id,
+    }
+    if isinstance(recipients, Select):
+        source = recipients.distinct().subquery()
+        columns = [
+            literal(value, Notification.__table__.c[name].type).label(name)
+            for name, value in values.items()
+        ]
+        result = db.session.execute(
+            insert(Notification).from_select(
+                ["user_id", *values], select(source.c[0], *columns)
+            )
+        )
+        adjust_unread_notifications(User.id.in_(select(source.c[0])), 1)
+        return result.rowcount
+
+    user_ids = list(dict.fromkeys(recipients))
+    for start in range(0, len(user_ids), NOTIFICATION_CHUNK_SIZE):
+        chunk = user_ids[start : start + NOTIFICATION_CHUNK_SIZE]
+        db.session.execute(
+            insert(Notification), [dict(values, user_id=user_id) for user_id in chunk]
+        )
+        adjust_unread_notifications(User.id.in_(chunk), 1)
+    return len(user_ids)
+
+
+def adjust_unread_notifications(criteria, delta):
+    result = db.session.execute(
+        update(User)
+        .where(criteria)
+        .values(
+            unread_notifications=User.unread_notifications + delta,
+            updated_at=User.updated_at,
+        )
+        .returning(User.id)
+        .execution_options(synchronize_session=False)
+    )
+    invalidate_identities(f"user:{user_id}" for user_id in result.scalars())
+
+
+def mark_notifications_read(user_id, ids=None, before=None):
+    stmt = update(Notification).where(
+        Notification.user_id == user_id, Notification.is_read.is_not(True)
+    )
+    if ids is not None:
+        stmt = stmt.where(Notification.id.in_(ids))
+    if before is not None:
+        stmt = stmt.where(
+            tuple_(Notification.created_at, Notification.id)
+            < tuple_(literal(before[0], DateTime()), literal(before[1]))
+        )
+    result = db.session.execute(
+        stmt.values(is_read=True).execution_options(synchronize_session=False)
+    )
+    if result.rowcount:
+        adjust_unread_notifications(User.id == user_id, -result.rowcount)
+    return result.rowcount
+
+
+ARCHIVED_COLUMNS = [
+    "id",
+    "user_id",
+    "type",
+    "title",
+    "body",
+    "created_at",
+    "related_object_type",
+    "related_object_id",
+]
+
+
+def archive_notification_batch(ntype, cutoff, limit):
+    ids = db.session.scalars(
+        select(Notification.id)
+        .where(
+            Notification.type == ntype,
+            Notification.is_read.is_(True),
+            Notification.created_at < cutoff,
+        )
+        .order_by(Notification.created_at)
+        .limit(limit)
+    ).all()
+    if not ids:
+        return 0
+    source = select(
+        *[Notification.__table__.c[name] for name in ARCHIVED_COLUMNS],
+        literal(datetime.utcnow(), DateTime()),
+    ).where(Notification.id.in_(ids))
+    db.session.execute(
+        insert(NotificationArchive).from_select([*ARCHIVED_COLUMNS, "archived_at"], source)
+    )
+    db.session.execute(
+        delete(Notification)
+        .where(Notification.id.in_(ids))
+        .execution_options(synchronize_session=False)
+    )
+    return len(ids)
+
+
+def recount_unread_notifications():
+    unread = (
+        select(func.count())
+        .select_from(Notification)
+        .where(Notification.user_id == User.id, Notification.is_read.is_not(True))
+        .scalar_subquery()
+    )
+    result = db.session.execute(
+        update(User)
+        .where(User.unread_notifications != unread)
+        .values(unread_notifications=unread, updated_at=User.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+@deferrable("notify_club_members", timestamp="created_at")
+def notify_club_members(
+    club_id,
+    ntype,
+    title,
+    body,
+    related_object_type=None,
+    related_object_id=None,
+    created_at=None,
+):
+    return create_notifications.__wrapped__(
+        select(Membership.user_id).filter_by(club_id=club_id, is_active=True),
+        ntype,
+        title,
+        body,
+        related_object_type=related_object_type,
+        related_object_id=related_object_id,
+        created_at=created_at,
+    )
+
+
+@deferrable("log_audit", timestamp="created_at")
+def log_audit(
+    actor_type, actor_id, action, object_type, object_id, details=None, created_at=None
+):
     entry = AuditLog(
         actor_type=actor_type,
         actor_id=actor_id,
@@ -27,14 +228,208 @@ def log_audit(actor_type, actor_id, action, object_type, object_id, details=None
         object_type=object_type,
         object_id=object_id,
         details=details,
-        created_at=datetime.utcnow(),
+        created_at=created_at or datetime.utcnow(),
     )
     db.session.add(entry)
     return entry
 
 
+def claim_event_seat(event_id):
+    result = db.session.execute(
+        update(Event)
+        .where(
+            Event.id == event_id,
+            or_(Event.capacity.is_(None), Event.registered_count < Event.capacity),
+        )
+        .values(registered_count=Event.registered_count + 1)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+def release_event_seat(event_id):
+    db.session.execute(
+        update(Event)
+        .where(Event.id == event_id, Event.registered_count > 0)
+        .values(registered_count=Event.registered_count - 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def next_waitlist_position(event_id):
+    return (
+        select(func.coalesce(func.max(EventRegistration.waitlist_position), 0) + 1)
+        .where(
+            EventRegistration.event_id == event_id,
+            EventRegistration.status == EventRegistrationStatus.WAITLISTED,
+        )
+        .scalar_subquery()
+    )
+
+
+def waitlist_rank(registration):
+    ahead = db.session.scalar(
+        select(func.count())
+        .select_from(EventRegistration)
+        .where(
+            EventRegistration.event_id == registration.event_id,
+            EventRegistration.status == EventRegistrationStatus.WAITLISTED,
+            EventRegistration.waitlist_position < registration.waitlist_position,
+        )
+    )
+    return ahead + 1
+
+
+def promote_waitlist(event_id):
+    capacity, registered = db.session.execute(
+        select(Event.capacity, Event.registered_count).where(Event.id == event_id)
+    ).one()
+    head = select(EventRegistration.id, EventRegistration.user_id).where(
+        EventRegistration.event_id == event_id,
+        EventRegistration.status == EventRegistrationStatus.WAITLISTED,
+    )
+    if capacity is not None:
+        if registered >= capacity:
+            return []
+        head = head.limit(capacity - registered)
+    rows = db.session.execute(
+        head.order_by(EventRegistration.waitlist_position, EventRegistration.id)
+    ).all()
+    if not rows:
+        return []
+
+    seats = len(rows)
+    claimed = db.session.execute(
+        update(Event)
+        .where(
+            Event.id == event_id,
+            or_(Event.capacity.is_(None), Event.registered_count + seats <= Event.capacity),
+        )
+        .values(registered_count=Event.registered_count + seats)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not claimed:
+        return []
+
+    ids = [row.id for row in rows]
+    promoted = db.session.execute(
+        update(EventRegistration)
+        .where(
+            EventRegistration.id.in_(ids),
+            EventRegistration.status == EventRegistrationStatus.WAITLISTED,
+        )
+        .values(
+            status=EventRegistrationStatus.REGISTERED,
+            registered_at=datetime.utcnow(),
+            waitlist_position=None,
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if promoted == seats:
+        return [row.user_id for row in rows]
+
+    db.session.execute(
+        update(Event)
+        .where(Event.id == event_id)
+        .values(registered_count=Event.registered_count - (seats - promoted))
+        .execution_options(synchronize_session=False)
+    )
+    return db.session.scalars(
+        select(EventRegistration.user_id).where(
+            EventRegistration.id.in_(ids),
+            EventRegistration.status == EventRegistrationStatus.REGISTERED,
+        )
+    ).all()
+
+
+def recount_event_registrations():
+    counts = dict(
+        db.session.execute(
+            select(EventRegistration.event_id, func.count())
+            .where(EventRegistration.status == EventRegistrationStatus.REGISTERED)
+            .group_by(EventRegistration.event_id)
+        ).all()
+    )
+    stale = [
+        {"id": event_id, "registered_count": counts.get(event_id, 0)}
+        for event_id, stored in db.session.execute(select(Event.id, Event.registered_count))
+        if stored != counts.get(event_id, 0)
+    ]
+    if stale:
+        db.session.execute(update(Event), stale)
+    return len(stale)
+
+
 def get_page(default=1):
     try:
         return int(request.args.get("page", default))
     except (TypeError, ValueError):
         return default
+
+
+COUNT_CACHE_SIZE = 1024
+_count_cache = OrderedDict()
+_count_cache_lock = threading.Lock()
+
+
+def cached_count(key, query, ttl):
+    now = time.monotonic()
+    with _count_cache_lock:
+        entry = _count_cache.get(key)
+        if entry and entry[1] > now:
+            _count_cache.move_to_end(key)
+            return entry[0]
+    total = query.order_by(None).count()
+    with _count_cache_lock:
+        _count_cache[key] = (total, now + ttl)
+        _count_cache.move_to_end(key)
+        while len(_count_cache) > COUNT_CACHE_SIZE:
+            _count_cache.popitem(last=False)
+    return total
+
+
+class KeysetPage:
+    def __init__(self, items, next_cursor, total=None):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.total = total
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+def encode_cursor(values):
+    raw = json.dumps(
+        [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, columns):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(columns):
+            return None
+        return [
+            datetime.fromisoformat(value) if isinstance(column.type, DateTime) else value
+            for column, value in zip(columns, values)
+        ]
+    except (binascii.Error, TypeError, ValueError):
+        return None
+
+
+def keyset_paginate(query, columns, cursor=None, per_page=10, descending=False, total=None):
+    values = decode_cursor(cursor, columns) if cursor else None
+    if values is not None:
+        key = tuple_(*columns)
+        bound = tuple_(*[literal(value, column.type) for column, value in zip(columns, values)])
+        query = query.filter(key < bound if descending else key > bound)
+    ordering = [column.desc() if descending else column.asc() for column in columns]
+    rows = query.order_by(*ordering).limit(per_page + 1).all()
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        next_cursor = encode_cursor([getattr(rows[-1], column.key) for column in columns])
+    return KeysetPage(rows, next_cursor, total)
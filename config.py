@@ -19,10 +19,65 @@ class Config:
     REMEMBER_COOKIE_HTTPONLY = True
     SESSION_COOKIE_SAMESITE = "Lax"
     ITEMS_PER_PAGE = 10
+    LISTING_PAGINATION = os.getenv("LISTING_PAGINATION", "keyset")
+    LISTING_COUNT_TTL = 30
+    NOTIFICATIONS_PER_PAGE = 20
+    NOTIFICATION_RETENTION_DAYS = {
+        "ANNOUNCEMENT": 30,
+        "EVENT_STATUS": 90,
+        "MEMBERSHIP_DECISION": 180,
+        "FOUNDER_INVITE": 90,
+        "FOUNDER_RESPONSE": 90,
+        "CLUB_APP_DECISION": None,
+    }
+    NOTIFICATION_ARCHIVE_BATCH_SIZE = 500
+    JOBS_DEFER_SIDE_EFFECTS = os.getenv("JOBS_DEFER_SIDE_EFFECTS", "0") == "1"
+    JOBS_WORKER_THREADS = int(os.getenv("JOBS_WORKER_THREADS", "4"))
+    JOBS_POLL_INTERVAL = float(os.getenv("JOBS_POLL_INTERVAL", "1.0"))
+    JOBS_BATCH_SIZE = 50
+    JOBS_MAX_ATTEMPTS = 5
+    JOBS_LEASE_SECONDS = 300
+    QUERY_INSTRUMENTATION = os.getenv("QUERY_INSTRUMENTATION", "0") == "1"
+    QUERY_BUDGET = 20
+    QUERY_REPEAT_THRESHOLD = 5
+    SERVER_TIMING = os.getenv("SERVER_TIMING", "0") == "1"
+    SERVER_TIMING_LOG = os.getenv("SERVER_TIMING_LOG", "0") == "1"
+    SLOW_QUERY_THRESHOLD_MS = (
+        float(os.environ["SLOW_QUERY_THRESHOLD_MS"])
+        if os.getenv("SLOW_QUERY_THRESHOLD_MS")
+        else 250.0
+    )
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+    METRICS_DIR = os.getenv("METRICS_DIR", (BASE_DIR / "instance" / "metrics").as_posix())
+    METRICS_FLUSH_INTERVAL = 5
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+    METRICS_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    IDENTITY_CACHE_TTL = int(os.getenv("IDENTITY_CACHE_TTL", "30"))
+    IDENTITY_CACHE_SIZE = 4096
+    LOGIN_RATE_LIMIT = 5
+    LOGIN_RATE_WINDOW = 300
+    RATELIMIT_BACKEND = os.getenv("RATELIMIT_BACKEND", "sqlite")
+    RATELIMIT_STORAGE = os.getenv(
+        "RATELIMIT_STORAGE", (BASE_DIR / "instance" / "ratelimit.db").as_posix()
+    )
+    RATELIMIT_MAX_KEYS = 10_000
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    PASSWORD_HASH_QUEUE = 16
+    PASSWORD_HASH_TIMEOUT = 5.0
+    DATA_CACHE_BACKEND = os.getenv("DATA_CACHE_BACKEND", "sqlite")
+    DATA_CACHE_STORAGE = os.getenv(
+        "DATA_CACHE_STORAGE", (BASE_DIR / "instance" / "cache.db").as_posix()
+    )
+    DATA_CACHE_TTL = 300
+    DATA_CACHE_MAX_ENTRIES = 2048
+    DATA_CACHE_WAIT_TIMEOUT = 5.0
 
 
 class DevelopmentConfig(Config):
     DEBUG = True
+    QUERY_INSTRUMENTATION = True
+    SERVER_TIMING = True
 
 
 class ProductionConfig(Config):
@@ -31,7 +86,31 @@ class ProductionConfig(Config):
     REMEMBER_COOKIE_SECURE = True
 
 
+class LoadTestConfig(Config):
+    WTF_CSRF_ENABLED = False
+    SQLALCHEMY_DATABASE_URI = os.getenv(
+        "LOADTEST_DATABASE_URL",
+        f"sqlite:///{(BASE_DIR / 'instance' / 'loadtest.db').as_posix()}",
+    )
+    METRICS_DIR = None
+
+
 class TestingConfig(Config):
     TESTING = True
     WTF_CSRF_ENABLED = False
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+    JOBS_DEFER_SIDE_EFFECTS = False
+    LISTING_COUNT_TTL = 0
+    QUERY_INSTRUMENTATION = True
+    SERVER_TIMING = True
+    METRICS_DIR = None
+    SLOW_QUERY_THRESHOLD_MS = None
+    RATELIMIT_BACKEND = "memory"
+    PASSWORD_HASH_METHOD = "pbkdf2:sha256:1000"
+    DATA_CACHE_BACKEND = "memory"
+
+
+class BenchmarkConfig(TestingConfig):
+    QUERY_INSTRUMENTATION = False
+    SERVER_TIMING = False
+    METRICS_ENABLED = False
@@ -0,0 +1,32 @@
+"""club search index
+
+Revision ID: b7d2e5a1c903
+Revises: f3a03457743c
+Create Date: 2026-10-17 00:27:41.118302
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d2e5a1c903'
+down_revision = 'f3a03457743c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute("CREATE VIRTUAL TABLE club_search USING fts5(name, category, description)")
+    op.execute(
+        "INSERT INTO club_search (rowid, name, category, description) "
+        "SELECT id, name, COALESCE(category, ''), description FROM clubs"
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute("DROP TABLE club_search")
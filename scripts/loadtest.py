@@ -0,0 +1,375 @@
+"""Replay a realistic traffic mix against a synthetic dataset and report latency.
+
+Examples:
+
+    python scripts/loadtest.py --scale small --requests 2000
+    python scripts/loadtest.py --scale large --output results/large.json
+    python scripts/loadtest.py --target http://127.0.0.1:8000 --concurrency 16
+
+With ``--target`` the requests go to a running server instead of the Flask test
+client. Start it with ``APP_ENV=loadtest`` and the same ``LOADTEST_DATABASE_URL``
+so it serves the dataset the harness generated.
+"""
+
+import argparse
+import json
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.cookiejar import CookieJar
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app import create_app
+from app.extensions import db
+from scripts.seed import bulk_student_email, seed_bulk_data
+
+
+PASSWORD = "LoadTest123"
+CHUNK_SIZE = 5000
+
+SCALES = {
+    "tiny": {"students": 50, "clubs": 5},
+    "small": {"students": 2_000, "clubs": 100},
+    "medium": {"students": 10_000, "clubs": 500},
+    "large": {"students": 50_000, "clubs": 2_000},
+}
+PER_CLUB = {
+    "members": 25,
+    "pending_applications": 10,
+    "events": 4,
+    "registrations": 15,
+}
+NOTIFICATIONS_PER_STUDENT = 5
+
+# Relative weight of each scenario in the traffic mix.
+MIX = {
+    "student_browse": 70,
+    "student_register": 15,
+    "manager_decide": 10,
+    "admin_approve": 5,
+}
+
+
+def build_dataset(students, clubs, seed=42):
+    """Create a fresh schema filled with ``students`` and ``clubs`` worth of rows.
+
+    Returns the credentials and ids the scenarios pick from.
+    """
+    return seed_bulk_data(
+        students=students,
+        clubs=clubs,
+        members_per_club=PER_CLUB["members"],
+        applications_per_club=PER_CLUB["pending_applications"],
+        events_per_club=PER_CLUB["events"],
+        pending_events_per_club=1,
+        registrations_per_event=PER_CLUB["registrations"],
+        notifications_per_student=NOTIFICATIONS_PER_STUDENT,
+        batch_size=CHUNK_SIZE,
+        seed=seed,
+        student_password=PASSWORD,
+        manager_password=PASSWORD,
+    )
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {}
+
+    def add(self, label, seconds, ok):
+        with self.lock:
+            self.samples.setdefault(label, []).append((seconds, ok))
+
+
+class FlaskClientSession:
+    def __init__(self, app, recorder):
+        self.client = app.test_client()
+        self.recorder = recorder
+
+    def request(self, label, method, url, data=None):
+        started = time.perf_counter()
+        response = self.client.open(url, method=method, data=data)
+        elapsed = time.perf_counter() - started
+        self.recorder.add(label, elapsed, response.status_code < 400)
+        return response.status_code
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class HttpSession:
+    def __init__(self, base_url, recorder):
+        self.base_url = base_url.rstrip("/")
+        self.recorder = recorder
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(CookieJar()), _NoRedirect()
+        )
+
+    def request(self, label, method, url, data=None):
+        body = urllib.parse.urlencode(data, doseq=True).encode() if data is not None else None
+        req = urllib.request.Request(self.base_url + url, data=body, method=method)
+        started = time.perf_counter()
+        try:
+            with self.opener.open(req, timeout=30) as response:
+                response.read()
+                status = response.status
+        except urllib.error.HTTPError as exc:
+            status = exc.code
+        except OSError:
+            status = 599
+        self.recorder.add(label, time.perf_counter() - started, status < 400)
+        return status
+
+
+class VirtualUser:
+    """One logged-in browser session playing a single role."""
+
+    def __init__(self, session, role, email, password, rng, dataset, state):
+        self.session = session
+        self.role = role
+        self.rng = rng
+        self.dataset = dataset
+        self.state = state
+        login_url = "/manager/login" if role == "manager" else "/auth/login"
+        session.request(f"{role}.login", "POST", login_url, {"email": email, "password": password})
+
+    def student_browse(self):
+        rng = self.rng
+        club_id = rng.choice(self.dataset["club_ids"])
+        event_id = rng.choice(self.dataset["event_ids"])
+        request = self.session.request
+        page = rng.choice(["dashboard", "clubs", "search", "club", "events", "event", "inbox"])
+        if page == "dashboard":
+            request("student.dashboard", "GET", "/dashboard")
+        elif page == "clubs":
+            request("student.clubs", "GET", "/clubs")
+        elif page == "search":
+            request("student.clubs[q]", "GET", f"/clubs?q={rng.choice(['tech', 'arts', 'sports'])}")
+        elif page == "club":
+            request("student.club_detail", "GET", f"/clubs/{club_id}")
+        elif page == "events":
+            request("student.events", "GET", "/events")
+        elif page == "event":
+            request("student.event_detail", "GET", f"/events/{event_id}")
+        else:
+            request("student.notifications", "GET", "/notifications")
+
+    def student_register(self):
+        event_id = self.rng.choice(self.dataset["upcoming_event_ids"])
+        self.session.request("student.register_event", "POST", f"/events/{event_id}/register")
+        self.session.request("student.cancel_event", "POST", f"/events/{event_id}/cancel")
+
+    def manager_decide(self):
+        club_id = self.state["club_id"]
+        self.session.request(
+            "manager.membership_applications", "GET", "/manager/memberships/applications"
+        )
+        with self.state["lock"]:
+            queue = self.dataset["pending_applications"].get(club_id) or []
+            application_id = queue.pop() if queue else None
+        if application_id is None:
+            return
+        self.session.request(
+            "manager.decide_membership",
+            "POST",
+            f"/manager/memberships/applications/{application_id}/decide",
+            {"decision": self.rng.choice(["approve", "reject"]), "decision_reason": "Load test"},
+        )
+
+    def admin_approve(self):
+        self.session.request("admin.event_proposals", "GET", "/admin/events/proposals")
+        with self.state["lock"]:
+            queue = self.dataset["pending_event_ids"]
+            event_id = queue.pop() if queue else None
+        if event_id is None:
+            return
+        self.session.request(
+            "admin.event_proposal_detail",
+            "POST",
+            f"/admin/events/proposals/{event_id}",
+            {"decision": "approve", "admin_comment": "Load test"},
+        )
+
+
+def run_load_test(make_session, dataset, total_requests, concurrency, seed=42):
+    """Play ``total_requests`` scenarios split across ``concurrency`` workers."""
+    recorder = Recorder()
+    lock = threading.Lock()
+    scenarios = list(MIX)
+    weights = [MIX[name] for name in scenarios]
+
+    def worker(index, count):
+        rng = random.Random(seed + index)
+        session = lambda: make_session(recorder)
+        club_id = rng.choice(dataset["club_ids"])
+        users = {
+            "student": VirtualUser(
+                session(),
+                "student",
+                bulk_student_email(rng.randrange(len(dataset["student_ids"]))),
+                PASSWORD,
+                rng,
+                dataset,
+                {"lock": lock},
+            ),
+            "manager": VirtualUser(
+                session(),
+                "manager",
+                dataset["manager_emails"][club_id],
+                PASSWORD,
+                rng,
+                dataset,
+                {"lock": lock, "club_id": club_id},
+            ),
+            "admin": VirtualUser(
+                session(),
+                "admin",
+                dataset["admin_email"],
+                dataset["admin_password"],
+                rng,
+                dataset,
+                {"lock": lock},
+            ),
+        }
+        for _ in range(count):
+            scenario = rng.choices(scenarios, weights)[0]
+            role = scenario.split("_", 1)[0]
+            getattr(users[role], scenario)()
+
+    started = time.perf_counter()
+    share, extra = divmod(total_requests, concurrency)
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [
+            pool.submit(worker, index, share + (1 if index < extra else 0))
+            for index in range(concurrency)
+        ]
+        for future in futures:
+            future.result()
+    return recorder, time.perf_counter() - started
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def summarize(recorder, elapsed):
+    endpoints = {}
+    for label, samples in sorted(recorder.samples.items()):
+        durations = sorted(seconds * 1000 for seconds, _ in samples)
+        endpoints[label] = {
+            "count": len(samples),
+            "errors": sum(1 for _, ok in samples if not ok),
+            "throughput_rps": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+            "mean_ms": round(sum(durations) / len(durations), 3),
+            "p50_ms": round(percentile(durations, 0.50), 3),
+            "p95_ms": round(percentile(durations, 0.95), 3),
+            "p99_ms": round(percentile(durations, 0.99), 3),
+            "max_ms": round(durations[-1], 3),
+        }
+    total = sum(stats["count"] for stats in endpoints.values())
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "requests": total,
+        "errors": sum(stats["errors"] for stats in endpoints.values()),
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "endpoints": endpoints,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--students", type=int, help="Override the scale's student count.")
+    parser.add_argument("--clubs", type=int, help="Override the scale's club count.")
+    parser.add_argument("--requests", type=int, default=1000, help="Scenarios to play.")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--target", help="Base URL of a running server (default: test client).")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--output",
+        default=str(PROJECT_ROOT / "instance" / "loadtest.json"),
+        help="Where to write the JSON report.",
+    )
+    args = parser.parse_args(argv)
+
+    scale = dict(SCALES[args.scale])
+    if args.students:
+        scale["students"] = args.students
+    if args.clubs:
+        scale["clubs"] = args.clubs
+
+    app = create_app("loadtest")
+    with app.app_context():
+        started = time.perf_counter()
+        dataset = build_dataset(scale["students"], scale["clubs"], seed=args.seed)
+        build_seconds = time.perf_counter() - started
+        db.session.remove()
+    print(f"Built {args.scale} dataset {scale} in {build_seconds:.1f}s")
+
+    if args.target:
+        make_session = lambda recorder: HttpSession(args.target, recorder)
+    else:
+        make_session = lambda recorder: FlaskClientSession(app, recorder)
+    recorder, elapsed = run_load_test(
+        make_session, dataset, args.requests, args.concurrency, seed=args.seed
+    )
+
+    report = {
+        "meta": {
+            "started_at": datetime.utcnow().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "target": args.target or "test-client",
+            "scale": {"name": args.scale, **scale},
+            "concurrency": args.concurrency,
+            "scenarios": args.requests,
+            "mix": MIX,
+            "dataset_build_s": round(build_seconds, 3),
+        },
+        **summarize(recorder, elapsed),
+    }
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+
+    print(f"{'endpoint':40} {'count':>7} {'err':>5} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for label, stats in report["endpoints"].items():
+        print(
+            f"{label:40} {stats['count']:>7} {stats['errors']:>5} "
+            f"{stats['p50_ms']:>8.1f}ms {stats['p95_ms']:>8.1f}ms {stats['p99_ms']:>8.1f}ms"
+        )
+    print(f"{report['requests']} requests in {elapsed:.1f}s ({report['throughput_rps']} req/s)")
+    print(f"Report written to {output}")
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
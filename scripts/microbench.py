@@ -0,0 +1,309 @@
+"""Microbenchmarks for the code that runs on every request or every write.
+
+    python scripts/microbench.py                         # run and print
+    python scripts/microbench.py --save                  # store instance/benchmarks/<commit>.json
+    python scripts/microbench.py --compare baseline.json # exit 1 on a significant slowdown
+
+A comparison flags a benchmark when its samples are slower than the baseline's
+with a one-sided Mann-Whitney U test below ``--alpha`` *and* the median moved
+by more than ``--threshold``; noise on a busy machine has to clear both bars.
+"""
+
+import argparse
+import json
+import math
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from statistics import median
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from flask_login import login_user
+from werkzeug.security import generate_password_hash
+
+from app import create_app
+from app.extensions import db, login_manager
+from app.models import (
+    AuditActorType,
+    Club,
+    ClubManager,
+    ClubStatus,
+    Event,
+    EventStatus,
+    NotificationType,
+    User,
+    UserRole,
+)
+from app.ratelimit import login_limiter
+from app.rbac import manager_required, student_required
+from app.utils import create_notification, log_audit
+
+
+BENCHMARKS = {}
+SAMPLE_SECONDS = 0.02
+
+
+def benchmark(name):
+    """Register ``setup(fixtures)``; it returns the zero-argument callable to time."""
+
+    def decorator(setup):
+        BENCHMARKS[name] = setup
+        return setup
+
+    return decorator
+
+
+def _fixtures():
+    password_hash = generate_password_hash("Password123")
+    student = User(
+        role=UserRole.STUDENT,
+        name="Bench",
+        surname="Student",
+        email="bench@example.com",
+        university_id="B0001",
+        password_hash=password_hash,
+    )
+    club = Club(name="Bench Club", description="Bench", status=ClubStatus.APPROVED)
+    db.session.add_all([student, club])
+    db.session.flush()
+    manager = ClubManager(club_id=club.id, email="bench@clubs.edu", password_hash=password_hash)
+    start = datetime.utcnow() + timedelta(days=7)
+    event = Event(
+        club_id=club.id,
+        title="Bench Event",
+        description="Bench",
+        location="Hall",
+        start_datetime=start,
+        end_datetime=start + timedelta(hours=1),
+        capacity=100,
+        registered_count=42,
+        status=EventStatus.APPROVED,
+    )
+    db.session.add_all([manager, event])
+    db.session.commit()
+    return {"student": student, "manager": manager, "event": event}
+
+
+@benchmark("load_user")
+def bench_load_user(fixtures):
+    user_id = f"user:{fixtures['student'].id}"
+
+    def run():
+        # Each request starts with an empty identity map.
+        db.session.expunge_all()
+        login_manager._user_callback(user_id)
+
+    return run
+
+
+@benchmark("roles_required")
+def bench_roles_required(fixtures):
+    view = student_required(lambda: None)
+    login_user(fixtures["student"])
+    return view
+
+
+@benchmark("manager_required")
+def bench_manager_required(fixtures):
+    view = manager_required(lambda: None)
+    login_user(fixtures["manager"])
+    return view
+
+
+@benchmark("rate_limited")
+def bench_rate_limited(fixtures):
+    limiter = login_limiter()
+    for _ in range(limiter.limit - 1):
+        limiter.hit("auth:10.0.0.1")
+
+    def run():
+        limiter.blocked("auth:10.0.0.1")
+
+    return run
+
+
+@benchmark("create_notification")
+def bench_create_notification(fixtures):
+    user_id = fixtures["student"].id
+
+    def run():
+        create_notification(user_id, NotificationType.ANNOUNCEMENT, "Bench", "Body")
+        db.session.flush()
+
+    return run
+
+
+@benchmark("log_audit")
+def bench_log_audit(fixtures):
+    def run():
+        log_audit(AuditActorType.USER_ADMIN, 1, "bench", "Event", 1, details="bench")
+        db.session.flush()
+
+    return run
+
+
+@benchmark("event_is_full")
+def bench_event_is_full(fixtures):
+    event = fixtures["event"]
+    return lambda: event.is_full
+
+
+def _calibrate(fn):
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= SAMPLE_SECONDS or loops >= 1_000_000:
+            return loops
+        loops *= 2 if elapsed == 0 else max(2, min(10, int(SAMPLE_SECONDS / elapsed) + 1))
+
+
+def measure(fn, samples):
+    """Return ``samples`` per-call timings in nanoseconds."""
+    loops = _calibrate(fn)
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        timings.append((time.perf_counter() - started) / loops * 1e9)
+    return timings
+
+
+def run_benchmarks(names=None, samples=30):
+    app = create_app("benchmark")
+    results = {}
+    with app.app_context():
+        db.create_all()
+        for name, setup in BENCHMARKS.items():
+            if names and name not in names:
+                continue
+            with app.test_request_context():
+                fixtures = _fixtures()
+                fn = setup(fixtures)
+                results[name] = measure(fn, samples)
+                db.session.rollback()
+            db.session.remove()
+            db.drop_all()
+            db.create_all()
+    return results
+
+
+def mann_whitney_p(baseline, current):
+    """One-sided p-value that ``current`` tends to be larger than ``baseline``."""
+    combined = sorted(
+        [(value, 0) for value in baseline] + [(value, 1) for value in current]
+    )
+    ranks = [0.0] * len(combined)
+    index = 0
+    while index < len(combined):
+        end = index
+        while end + 1 < len(combined) and combined[end + 1][0] == combined[index][0]:
+            end += 1
+        for position in range(index, end + 1):
+            ranks[position] = (index + end) / 2 + 1
+        index = end + 1
+    n1, n2 = len(current), len(baseline)
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 1)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    mean = n1 * n2 / 2
+    sigma = math.sqrt(n1 * n2 * (n1 + n2 + 1) / 12)
+    if sigma == 0:
+        return 1.0
+    z = (u - mean) / sigma
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def compare(baseline, current, alpha=0.01, threshold=0.05):
+    rows = []
+    for name, samples in current.items():
+        previous = baseline.get(name)
+        if not previous:
+            rows.append({"name": name, "status": "new", "median_ns": median(samples)})
+            continue
+        before, after = median(previous), median(samples)
+        change = (after - before) / before if before else 0.0
+        p_value = mann_whitney_p(previous, samples)
+        regressed = p_value < alpha and change > threshold
+        improved = mann_whitney_p(samples, previous) < alpha and change < -threshold
+        rows.append(
+            {
+                "name": name,
+                "status": "slower" if regressed else "faster" if improved else "same",
+                "baseline_ns": before,
+                "median_ns": after,
+                "change": change,
+                "p_value": p_value,
+            }
+        )
+    return rows
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("names", nargs="*", help="Benchmarks to run (default: all).")
+    parser.add_argument("--samples", type=int, default=30)
+    parser.add_argument("--save", nargs="?", const="", help="Store results as a baseline.")
+    parser.add_argument("--compare", help="Baseline JSON to compare against.")
+    parser.add_argument("--alpha", type=float, default=0.01)
+    parser.add_argument("--threshold", type=float, default=0.05, help="Minimum median change.")
+    args = parser.parse_args(argv)
+
+    unknown = set(args.names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(sorted(unknown))}")
+
+    commit = _git_commit()
+    results = run_benchmarks(args.names, args.samples)
+
+    if args.save is not None:
+        path = Path(args.save or PROJECT_ROOT / "instance" / "benchmarks" / f"{commit}.json")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"commit": commit, "samples_ns": results}, indent=2))
+        print(f"Saved baseline to {path}")
+
+    if not args.compare:
+        for name, samples in results.items():
+            print(f"{name:24} {median(samples):>12.0f} ns/op")
+        return 0
+
+    baseline = json.loads(Path(args.compare).read_text())
+    rows = compare(baseline["samples_ns"], results, alpha=args.alpha, threshold=args.threshold)
+    print(f"Comparing {commit} against {baseline['commit']}")
+    for row in rows:
+        if row["status"] == "new":
+            print(f"{row['name']:24} {row['median_ns']:>12.0f} ns/op  (new)")
+            continue
+        print(
+            f"{row['name']:24} {row['baseline_ns']:>12.0f} -> {row['median_ns']:>12.0f} ns/op "
+            f"{row['change']:>+7.1%}  p={row['p_value']:.4f}  {row['status']}"
+        )
+    slower = [row["name"] for row in rows if row["status"] == "slower"]
+    if slower:
+        print(f"Significant slowdown: {', '.join(slower)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
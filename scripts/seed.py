@@ -2,11 +2,14 @@ import os
 import random
 import re
 import sys
+import time
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from itertools import islice
 from pathlib import Path
 
 from faker import Faker
-from werkzeug.security import generate_password_hash
+from sqlalchemy import select, update
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
@@ -31,14 +34,14 @@ from app.models import (
     Membership,
     MembershipApplication,
     MembershipApplicationStatus,
+    Notification,
     NotificationType,
     User,
     UserRole,
 )
-from app.utils import create_notification, log_audit
-
-
-app = create_app()
+from app.passwords import hash_password
+from app.search import rebuild_club_search
+from app.utils import create_notification, create_notifications, log_audit
 
 
 def slugify(value):
@@ -63,7 +66,7 @@ def seed_admin(session):
         surname=surname,
         email=email,
         university_id=None,
-        password_hash=generate_password_hash(password),
+        password_hash=hash_password(password),
     )
     session.add(admin)
     session.flush()
@@ -71,6 +74,7 @@ def seed_admin(session):
 
 
 def seed_students(session, fake, count, password):
+    password_hash = hash_password(password)
     students = []
     for index in range(count):
         student = User(
@@ -79,7 +83,7 @@ def seed_students(session, fake, count, password):
             surname=fake.last_name(),
             university_id=f"S{10000 + index}",
             email=fake.unique.email(),
-            password_hash=generate_password_hash(password),
+            password_hash=password_hash,
         )
         students.append(student)
     session.add_all(students)
@@ -108,14 +112,14 @@ def seed_founder_invites(session, fake, application, students):
             else None,
         )
         session.add(invite)
-        create_notification(
-            student.id,
-            NotificationType.FOUNDER_INVITE,
-            "Founder Invitation",
-            f"You were invited to join the founders list for {application.proposed_name}.",
-            related_object_type="ClubApplication",
-            related_object_id=application.id,
-        )
+    create_notifications(
+        [student.id for student in invited],
+        NotificationType.FOUNDER_INVITE,
+        "Founder Invitation",
+        f"You were invited to join the founders list for {application.proposed_name}.",
+        related_object_type="ClubApplication",
+        related_object_id=application.id,
+    )
 
 
 def seed_club_applications(
@@ -192,7 +196,7 @@ def seed_club_applications(
             manager = ClubManager(
                 club_id=club.id,
                 email=club_email,
-                password_hash=generate_password_hash(manager_password),
+                password_hash=hash_password(manager_password),
             )
             session.add(manager)
             clubs.append(club)
@@ -331,15 +335,14 @@ def seed_announcements(session, fake, clubs, membership_map):
             )
             session.add(announcement)
             session.flush()
-            for user_id in membership_map.get(club.id, set()):
-                create_notification(
-                    user_id,
-                    NotificationType.ANNOUNCEMENT,
-                    f"{club.name} Announcement",
-                    announcement.title,
-                    related_object_type="Announcement",
-                    related_object_id=announcement.id,
-                )
+            create_notifications(
+                membership_map.get(club.id, set()),
+                NotificationType.ANNOUNCEMENT,
+                f"{club.name} Announcement",
+                announcement.title,
+                related_object_type="Announcement",
+                related_object_id=announcement.id,
+            )
 
 
 def seed_events(session, fake, clubs, students, admin):
@@ -362,6 +365,7 @@ def seed_events(session, fake, clubs, students, admin):
                 start_datetime=start_time,
                 end_datetime=end_time,
                 capacity=capacity,
+                registered_count=0,
                 registration_deadline=start_time - timedelta(days=2),
                 status=status,
                 created_by_manager_id=club.manager.id,
@@ -430,6 +434,8 @@ def seed_events(session, fake, clubs, students, admin):
                         else None,
                     )
                     session.add(registration)
+                    if not is_cancelled:
+                        event.registered_count += 1
 
 
 def seed_demo_data():
@@ -446,40 +452,341 @@ def seed_demo_data():
     Faker.seed(seed_value)
     random.seed(seed_value)
 
-    with app.app_context():
-        if seed_reset:
-            db.drop_all()
-            db.create_all()
-
-        existing_students = User.query.filter_by(role=UserRole.STUDENT).count()
-        existing_clubs = Club.query.count()
-        if existing_students or existing_clubs:
-            print("Demo data already exists. Set SEED_RESET=1 to recreate.")
-            return
+    if seed_reset:
+        db.drop_all()
+        db.create_all()
+
+    existing_students = User.query.filter_by(role=UserRole.STUDENT).count()
+    existing_clubs = Club.query.count()
+    if existing_students or existing_clubs:
+        print("Demo data already exists. Set SEED_RESET=1 to recreate.")
+        return
+
+    admin, admin_password, created = seed_admin(db.session)
+    students = seed_students(db.session, fake, student_count, student_password)
+    clubs, managers = seed_club_applications(
+        db.session,
+        fake,
+        students,
+        admin,
+        approved_clubs,
+        pending_clubs,
+        rejected_clubs,
+        manager_password,
+    )
+    membership_map = seed_memberships_and_applications(db.session, fake, clubs, students)
+    seed_announcements(db.session, fake, clubs, membership_map)
+    seed_events(db.session, fake, clubs, students, admin)
+    rebuild_club_search()
+    db.session.commit()
+
+    if created:
+        print(f"Created admin: {admin.email} / {admin_password}")
+    print(f"Student login password: {student_password}")
+    print(f"Club manager password: {manager_password}")
+    print(f"Seeded {len(students)} students, {len(clubs)} clubs, demo data ready.")
+
+
+BULK_PRAGMAS = {
+    "synchronous": "OFF",
+    "journal_mode": "MEMORY",
+    "temp_store": "MEMORY",
+    "cache_size": "-262144",
+}
+
+
+@contextmanager
+def relaxed_sqlite_pragmas(connection):
+    """Trade durability for speed while a bulk load runs, then restore the defaults."""
+    if connection.dialect.name != "sqlite":
+        yield
+        return
+    previous = {
+        name: connection.exec_driver_sql(f"PRAGMA {name}").scalar() for name in BULK_PRAGMAS
+    }
+    for name, value in BULK_PRAGMAS.items():
+        connection.exec_driver_sql(f"PRAGMA {name} = {value}")
+    connection.commit()
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            connection.exec_driver_sql(f"PRAGMA {name} = {value}")
+        connection.commit()
+
+
+def bulk_insert(connection, model, rows, batch_size):
+    """executemany ``rows`` (any iterable of dicts) in ``batch_size`` chunks."""
+    statement = model.__table__.insert()
+    rows = iter(rows)
+    total = 0
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return total
+        connection.execute(statement, batch)
+        total += len(batch)
+
+
+def _columns(keys, *columns):
+    return (dict(zip(keys, values)) for values in zip(*columns))
+
+
+def bulk_student_rows(count, password_hash, now):
+    keys = (
+        "role",
+        "name",
+        "surname",
+        "university_id",
+        "email",
+        "password_hash",
+        "is_active",
+        "unread_notifications",
+        "created_at",
+        "updated_at",
+    )
+    indexes = range(count)
+    return _columns(
+        keys,
+        (UserRole.STUDENT for _ in indexes),
+        ("Student" for _ in indexes),
+        (str(index) for index in indexes),
+        (f"B{index:08d}" for index in indexes),
+        (bulk_student_email(index) for index in indexes),
+        (password_hash for _ in indexes),
+        (True for _ in indexes),
+        (0 for _ in indexes),
+        (now for _ in indexes),
+        (now for _ in indexes),
+    )
+
 
-        admin, admin_password, created = seed_admin(db.session)
-        students = seed_students(db.session, fake, student_count, student_password)
-        clubs, managers = seed_club_applications(
-            db.session,
-            fake,
-            students,
-            admin,
-            approved_clubs,
-            pending_clubs,
-            rejected_clubs,
-            manager_password,
+def bulk_student_email(index):
+    return f"student{index}@bulk.edu"
+
+
+def seed_bulk_data(
+    students=100_000,
+    clubs=2_000,
+    members_per_club=50,
+    applications_per_club=0,
+    events_per_club=4,
+    pending_events_per_club=0,
+    registrations_per_event=60,
+    notifications_per_student=20,
+    batch_size=20_000,
+    seed=42,
+    student_password="StudentPass123",
+    manager_password="ManagerPass123",
+):
+    """Seed a large dataset quickly: one password hash, Core executemany, relaxed pragmas.
+
+    Starts from an empty schema. The last ``pending_events_per_club`` events of
+    each club await approval and get no registrations. Returns the credentials
+    and ids a caller needs to drive the dataset (see scripts/loadtest.py).
+    """
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+
+    db.drop_all()
+    db.create_all()
+    admin, admin_password, _ = seed_admin(db.session)
+    admin_id, admin_email = admin.id, admin.email
+    db.session.commit()
+    student_hash = hash_password(student_password)
+    manager_hash = hash_password(manager_password)
+
+    with db.engine.connect() as connection, relaxed_sqlite_pragmas(connection):
+        bulk_insert(connection, User, bulk_student_rows(students, student_hash, now), batch_size)
+        connection.commit()
+        student_ids = connection.execute(
+            select(User.id).where(User.role == UserRole.STUDENT).order_by(User.id)
+        ).scalars().all()
+
+        categories = ["Arts", "Sports", "Tech", "Culture", "Science", "Business"]
+        bulk_insert(
+            connection,
+            Club,
+            (
+                {
+                    "name": f"Bulk Club {index:06d}",
+                    "description": f"{categories[index % 6]} club number {index}",
+                    "category": categories[index % 6],
+                    "contact_email": f"club{index}@clubs.edu",
+                    "status": ClubStatus.APPROVED,
+                    "created_at": now,
+                    "updated_at": now,
+                    "approved_at": now,
+                    "applicant_user_id": rng.choice(student_ids),
+                }
+                for index in range(clubs)
+            ),
+            batch_size,
         )
-        membership_map = seed_memberships_and_applications(db.session, fake, clubs, students)
-        seed_announcements(db.session, fake, clubs, membership_map)
-        seed_events(db.session, fake, clubs, students, admin)
-        db.session.commit()
+        connection.commit()
+        club_rows = connection.execute(select(Club.id, Club.contact_email)).all()
+        manager_rows = (
+            {
+                "club_id": club_id,
+                "email": email,
+                "password_hash": manager_hash,
+                "is_active": True,
+                "created_at": now,
+            }
+            for club_id, email in club_rows
+        )
+
+        membership_count = min(members_per_club, len(student_ids))
+        application_count = min(applications_per_club, len(student_ids) - membership_count)
+        registration_count = min(registrations_per_event, len(student_ids))
+        memberships = []
+        applications = []
+        event_rows = []
+        for club_id, _ in club_rows:
+            picked = rng.sample(student_ids, membership_count + application_count)
+            memberships += [
+                {"club_id": club_id, "user_id": user_id, "is_active": True, "joined_at": now}
+                for user_id in picked[:membership_count]
+            ]
+            applications += [
+                {
+                    "club_id": club_id,
+                    "user_id": user_id,
+                    "status": MembershipApplicationStatus.PENDING,
+                    "message": "Let me in",
+                    "created_at": now,
+                }
+                for user_id in picked[membership_count:]
+            ]
+            for index in range(events_per_club):
+                pending = index >= events_per_club - pending_events_per_club
+                status = EventStatus.PENDING_APPROVAL if pending else EventStatus.APPROVED
+                start = now + timedelta(days=rng.randint(-60, 90), hours=index)
+                event_rows.append(
+                    {
+                        "club_id": club_id,
+                        "title": f"Event {index} of club {club_id}",
+                        "description": "Bulk seeded event",
+                        "location": "Main Hall",
+                        "start_datetime": start,
+                        "end_datetime": start + timedelta(hours=2),
+                        "capacity": None,
+                        "registered_count": 0 if pending else registration_count,
+                        "status": status,
+                        "created_at": now,
+                    }
+                )
 
-        if created:
-            print(f"Created admin: {admin.email} / {admin_password}")
-        print(f"Student login password: {student_password}")
-        print(f"Club manager password: {manager_password}")
-        print(f"Seeded {len(students)} students, {len(clubs)} clubs, demo data ready.")
+        bulk_insert(connection, ClubManager, manager_rows, batch_size)
+        bulk_insert(connection, Membership, memberships, batch_size)
+        bulk_insert(connection, MembershipApplication, applications, batch_size)
+        bulk_insert(connection, Event, event_rows, batch_size)
+        connection.commit()
+        events = connection.execute(
+            select(Event.id, Event.status, Event.start_datetime).order_by(Event.id)
+        ).all()
+        approved = [row for row in events if row.status == EventStatus.APPROVED]
+
+        registrations = bulk_insert(
+            connection,
+            EventRegistration,
+            (
+                {
+                    "event_id": event_id,
+                    "user_id": user_id,
+                    "status": EventRegistrationStatus.REGISTERED,
+                    "registered_at": now,
+                }
+                for event_id, _, _ in approved
+                for user_id in rng.sample(student_ids, registration_count)
+            ),
+            batch_size,
+        )
+        notifications = bulk_insert(
+            connection,
+            Notification,
+            (
+                {
+                    "user_id": user_id,
+                    "type": NotificationType.ANNOUNCEMENT,
+                    "title": "Announcement",
+                    "body": "Bulk seeded notification",
+                    "is_read": False,
+                    "created_at": now - timedelta(minutes=index),
+                }
+                for user_id in student_ids
+                for index in range(notifications_per_student)
+            ),
+            batch_size,
+        )
+        connection.execute(
+            update(User)
+            .where(User.role == UserRole.STUDENT)
+            .values(unread_notifications=notifications_per_student)
+        )
+        connection.commit()
+        pending_applications = {}
+        for club_id, application_id in connection.execute(
+            select(MembershipApplication.club_id, MembershipApplication.id)
+        ):
+            pending_applications.setdefault(club_id, []).append(application_id)
+
+    rebuild_club_search()
+    db.session.commit()
+
+    return {
+        "admin_id": admin_id,
+        "admin_email": admin_email,
+        "admin_password": admin_password,
+        "student_ids": student_ids,
+        "club_ids": [club_id for club_id, _ in club_rows],
+        "manager_emails": dict(club_rows),
+        "event_ids": [event_id for event_id, _, _ in approved],
+        "upcoming_event_ids": [
+            event_id for event_id, _, start in approved if start > now + timedelta(days=1)
+        ],
+        "pending_event_ids": [
+            event_id for event_id, status, _ in events if status == EventStatus.PENDING_APPROVAL
+        ],
+        "pending_applications": pending_applications,
+        "registrations": registrations,
+        "notifications": notifications,
+    }
+
+
+def main():
+    app = create_app()
+    with app.app_context():
+        if os.getenv("SEED_MODE", "demo") != "bulk":
+            seed_demo_data()
+            return
+        student_password = os.getenv("STUDENT_PASSWORD", "StudentPass123")
+        manager_password = os.getenv("MANAGER_PASSWORD", "ManagerPass123")
+        started = time.perf_counter()
+        dataset = seed_bulk_data(
+            students=int(os.getenv("SEED_STUDENTS", "100000")),
+            clubs=int(os.getenv("SEED_CLUBS", "2000")),
+            members_per_club=int(os.getenv("SEED_MEMBERS_PER_CLUB", "50")),
+            events_per_club=int(os.getenv("SEED_EVENTS_PER_CLUB", "4")),
+            registrations_per_event=int(os.getenv("SEED_REGISTRATIONS_PER_EVENT", "60")),
+            notifications_per_student=int(os.getenv("SEED_NOTIFICATIONS_PER_STUDENT", "20")),
+            batch_size=int(os.getenv("SEED_BATCH_SIZE", "20000")),
+            seed=int(os.getenv("SEED_RANDOM", "42")),
+            student_password=student_password,
+            manager_password=manager_password,
+        )
+        elapsed = time.perf_counter() - started
+
+    print(f"Admin: {dataset['admin_email']} / {dataset['admin_password']}")
+    print(f"Student login: {bulk_student_email(0)} / {student_password}")
+    print(f"Club manager password: {manager_password}")
+    print(
+        f"Bulk seeded {len(dataset['student_ids'])} students, {len(dataset['club_ids'])} clubs, "
+        f"{len(dataset['event_ids']) + len(dataset['pending_event_ids'])} events, "
+        f"{dataset['registrations']} registrations and "
+        f"{dataset['notifications']} notifications in {elapsed:.1f}s."
+    )
 
 
 if __name__ == "__main__":
-    seed_demo_data()
+    main()
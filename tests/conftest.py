@@ -1,9 +1,13 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
 import pytest
 from werkzeug.security import generate_password_hash
 
 from app import create_app
 from app.extensions import db
-from app.models import User, UserRole
+from app.instrumentation import query_stats_recorded
+from app.models import Club, ClubManager, ClubStatus, Event, EventStatus, User, UserRole
 
 
 @pytest.fixture()
@@ -34,3 +38,94 @@ def admin_user(app):
         db.session.add(admin)
         db.session.commit()
         return admin
+
+
+PASSWORD_HASH = generate_password_hash("Password123")
+
+
+def _student(index):
+    return User(
+        role=UserRole.STUDENT,
+        name="Student",
+        surname=str(index),
+        email=f"student{index}@example.com",
+        university_id=f"S{10000 + index}",
+        password_hash=PASSWORD_HASH,
+    )
+
+
+@pytest.fixture()
+def make_student(app):
+    """Build (without adding) student ``student<index>@example.com`` / ``Password123``."""
+    return _student
+
+
+@pytest.fixture()
+def club_and_event(app):
+    """An approved club run by ``chess@clubs.edu`` with one approved one-seat event,
+    and students ``student1..3@example.com``; all passwords are ``Password123``."""
+    club = Club(name="Chess Club", description="Play chess", status=ClubStatus.APPROVED)
+    students = [_student(index) for index in (1, 2, 3)]
+    db.session.add_all([club, *students])
+    db.session.flush()
+    club.applicant_user_id = students[0].id
+    start = datetime.utcnow() + timedelta(days=7)
+    event = Event(
+        club_id=club.id,
+        title="Blitz Night",
+        description="Fast games",
+        location="Hall A",
+        start_datetime=start,
+        end_datetime=start + timedelta(hours=2),
+        capacity=1,
+        status=EventStatus.APPROVED,
+        decided_at=datetime.utcnow(),
+    )
+    manager = ClubManager(
+        club_id=club.id,
+        email="chess@clubs.edu",
+        password_hash=PASSWORD_HASH,
+    )
+    db.session.add_all([event, manager])
+    db.session.commit()
+    return club.id, event.id
+
+
+@pytest.fixture()
+def login(client):
+    """Switch the test client to another account.
+
+    Following the redirect renders the landing page, which consumes the login flash.
+    """
+
+    def login(email, password="Password123", path="/auth/login"):
+        client.get("/auth/logout")
+        client.post(path, data={"email": email, "password": password}, follow_redirects=True)
+
+    return login
+
+
+@pytest.fixture()
+def query_budget(app):
+    """Fail when a request inside the block runs more than ``max_queries`` statements
+    or repeats one statement shape ``max_repeats`` times or more (an N+1 pattern)."""
+
+    @contextmanager
+    def budget(max_queries, max_repeats=None):
+        recorded = []
+
+        def receiver(sender, endpoint, stats):
+            recorded.append((endpoint, stats))
+
+        with query_stats_recorded.connected_to(receiver, app):
+            yield recorded
+        assert recorded, "no requests were made inside the query budget"
+        for endpoint, stats in recorded:
+            assert stats.count <= max_queries, (
+                f"{endpoint} ran {stats.count} queries (budget {max_queries})"
+            )
+            threshold = max_repeats or app.config["QUERY_REPEAT_THRESHOLD"]
+            repeated = stats.repeated(threshold)
+            assert not repeated, f"{endpoint} repeated statements: {repeated}"
+
+    return budget
@@ -0,0 +1,106 @@
+import pytest
+
+from app.extensions import db
+from app.models import Club, ClubStatus
+
+
+def _revalidate(client, url, response):
+    return client.get(url, headers={"If-None-Match": response.headers["ETag"]})
+
+
+@pytest.mark.parametrize("path", ["/clubs", "/clubs/{club}", "/events", "/events/{event}"])
+def test_unchanged_pages_answer_304_with_one_query(
+    client, club_and_event, login, query_budget, path
+):
+    club_id, event_id = club_and_event
+    url = path.format(club=club_id, event=event_id)
+    login("student1@example.com")
+    first = client.get(url)
+    assert first.status_code == 200
+    assert first.headers["ETag"].startswith('W/"')
+    assert first.headers["Last-Modified"]
+    assert "private" in first.headers["Cache-Control"]
+
+    with query_budget(1):
+        second = _revalidate(client, url, first)
+    assert second.status_code == 304
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert not second.data
+
+    modified_since = client.get(url, headers={"If-Modified-Since": first.headers["Last-Modified"]})
+    assert modified_since.status_code == 304
+
+
+def test_club_edits_and_other_viewers_change_the_validator(client, club_and_event, login):
+    club_id, _ = club_and_event
+    url = f"/clubs/{club_id}"
+    login("student1@example.com")
+    first = client.get(url)
+
+    club = db.session.get(Club, club_id)
+    club.description = "Play chess and go"
+    db.session.commit()
+    changed = _revalidate(client, url, first)
+    assert changed.status_code == 200
+    assert b"Play chess and go" in changed.data
+
+    login("student2@example.com")
+    assert _revalidate(client, url, changed).status_code == 200
+
+
+def test_waitlist_movement_changes_event_validator(client, club_and_event, login):
+    _, event_id = club_and_event
+    url = f"/events/{event_id}"
+    for index in (1, 2, 3):
+        login(f"student{index}@example.com")
+        client.post(f"/events/{event_id}/register")
+
+    client.get(url)  # consumes the flashed "added to the waitlist" message
+    first = client.get(url)
+    assert b"Waitlist position:</strong> 2" in first.data
+    assert _revalidate(client, url, first).status_code == 304
+
+    login("student2@example.com")
+    client.post(f"/events/{event_id}/cancel")
+    login("student3@example.com")
+    moved = _revalidate(client, url, first)
+    assert moved.status_code == 200
+    assert b"Waitlist position:</strong> 1" in moved.data
+
+
+def test_pending_flash_message_forces_render(client, club_and_event, login):
+    _, event_id = club_and_event
+    url = f"/events/{event_id}"
+    login("student1@example.com")
+    first = client.get(url)
+    client.post(f"/events/{event_id}/register")
+    client.post(f"/events/{event_id}/register")
+    response = _revalidate(client, url, first)
+    assert response.status_code == 200
+    assert b"already registered" in response.data
+
+
+def test_listing_total_follows_the_validator(app, client, club_and_event, login):
+    app.config["LISTING_COUNT_TTL"] = 30
+    login("student1@example.com")
+    first = client.get("/clubs")
+    assert b"1 clubs" in first.data
+
+    db.session.add(Club(name="Go Club", description="Play go", status=ClubStatus.APPROVED))
+    db.session.commit()
+    second = _revalidate(client, "/clubs", first)
+    assert second.status_code == 200
+    assert b"Go Club" in second.data
+    assert b"2 clubs" in second.data
+    assert _revalidate(client, "/clubs", second).status_code == 304
+
+
+@pytest.mark.parametrize("path", ["/clubs", "/clubs/{club}", "/events", "/events/{event}"])
+def test_head_requests_are_conditional_too(client, club_and_event, login, path):
+    club_id, event_id = club_and_event
+    url = path.format(club=club_id, event=event_id)
+    login("student1@example.com")
+    first = client.head(url)
+    assert first.status_code == 200
+    assert first.headers["ETag"] == client.get(url).headers["ETag"]
+    assert client.head(url, headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
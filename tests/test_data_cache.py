@@ -0,0 +1,95 @@
+import threading
+from datetime import datetime, timedelta
+
+from app.cache import DataCache, MemoryCache, SQLiteCache
+from app.extensions import db
+from app.models import Event, EventStatus
+
+
+def test_listing_is_served_from_cache_until_a_write_invalidates_it(
+    client, club_and_event, login, query_budget
+):
+    club_id, _ = club_and_event
+    login("student1@example.com")
+    with query_budget(3):
+        assert client.get("/clubs").status_code == 200
+    with query_budget(2):
+        assert client.get("/clubs").status_code == 200
+
+    login("chess@clubs.edu", path="/manager/login")
+    client.post(
+        "/manager/club/profile",
+        data={"name": "Chess Society", "description": "Play chess", "category": "Games"},
+    )
+
+    login("student1@example.com")
+    assert b"Chess Society" in client.get("/clubs").data
+    assert b"Chess Society" in client.get(f"/clubs/{club_id}").data
+
+
+def test_event_decision_refreshes_cached_event_listings(
+    client, club_and_event, login, admin_user
+):
+    club_id, _ = club_and_event
+    start = datetime.utcnow() + timedelta(days=7)
+    event = Event(
+        club_id=club_id,
+        title="Simul Night",
+        description="One against many",
+        location="Hall A",
+        start_datetime=start,
+        end_datetime=start + timedelta(hours=2),
+        status=EventStatus.PENDING_APPROVAL,
+    )
+    db.session.add(event)
+    db.session.commit()
+    event_id = event.id
+
+    login("student1@example.com")
+    assert b"Simul Night" not in client.get("/events").data
+    login("chess@clubs.edu", path="/manager/login")
+    assert b"PENDING_APPROVAL" in client.get("/manager/events").data
+
+    login("admin@example.com", "AdminPass123")
+    client.post(f"/admin/events/proposals/{event_id}", data={"decision": "approve"})
+
+    login("student1@example.com")
+    assert b"Simul Night" in client.get("/events").data
+    login("chess@clubs.edu", path="/manager/login")
+    assert b"PENDING_APPROVAL" not in client.get("/manager/events").data
+
+
+def test_concurrent_misses_share_one_load():
+    cache = DataCache(MemoryCache(max_entries=10), ttl=60, wait_timeout=5)
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        release.wait(5)
+        return ["row"]
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_load("k", ["t"], loader)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    while not cache.flights:
+        pass
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert results == [["row"]] * 5
+
+
+def test_sqlite_backend_shares_entries_and_tags(tmp_path):
+    path = tmp_path / "cache.db"
+    first = DataCache(SQLiteCache(path, max_entries=10), ttl=60, wait_timeout=5)
+    second = DataCache(SQLiteCache(path, max_entries=10), ttl=60, wait_timeout=5)
+    assert first.get_or_load("k", ["t"], lambda: "v1") == "v1"
+    assert second.get_or_load("k", ["t"], lambda: "v2") == "v1"
+    second.invalidate(["t"])
+    assert first.get_or_load("k", ["t"], lambda: "v3") == "v3"
@@ -0,0 +1,164 @@
+from datetime import datetime, timedelta
+
+import pytest
+from werkzeug.security import generate_password_hash
+
+from app.extensions import db
+from app.models import (
+    Club,
+    ClubApplication,
+    ClubFounderInvitation,
+    ClubManager,
+    ClubStatus,
+    Event,
+    EventRegistration,
+    EventStatus,
+    Membership,
+    MembershipApplication,
+    User,
+    UserRole,
+)
+
+
+PASSWORD_HASH = generate_password_hash("Password123")
+
+
+@pytest.fixture()
+def dataset(app, admin_user):
+    owner = User(
+        role=UserRole.STUDENT,
+        name="Owner",
+        surname="Student",
+        email="owner@example.com",
+        university_id="S00001",
+        password_hash=PASSWORD_HASH,
+    )
+    club = Club(name="Chess Club", description="Play chess", status=ClubStatus.APPROVED)
+    application = ClubApplication(
+        proposed_name="Go Club", proposed_description="Play go", applicant=owner
+    )
+    db.session.add_all([owner, club, application])
+    db.session.flush()
+    start = datetime.utcnow() + timedelta(days=7)
+    event = Event(
+        club_id=club.id,
+        title="Blitz Night",
+        description="Fast games",
+        location="Hall A",
+        start_datetime=start,
+        end_datetime=start + timedelta(hours=2),
+        capacity=100,
+        status=EventStatus.APPROVED,
+    )
+    db.session.add_all(
+        [event, ClubManager(club_id=club.id, email="chess@clubs.edu", password_hash=PASSWORD_HASH)]
+    )
+    db.session.commit()
+    return {
+        "owner": owner.id,
+        "club": club.id,
+        "event": event.id,
+        "application": application.id,
+    }
+
+
+def _add_students(dataset, start, count):
+    for index in range(start, start + count):
+        student = User(
+            role=UserRole.STUDENT,
+            name="Student",
+            surname=str(index),
+            email=f"student{index}@example.com",
+            university_id=f"S{10000 + index}",
+            password_hash=PASSWORD_HASH,
+        )
+        db.session.add(student)
+        db.session.flush()
+        other = Club(name=f"Club {index}", description="About", status=ClubStatus.APPROVED)
+        db.session.add(other)
+        db.session.flush()
+        db.session.add_all(
+            [
+                Membership(club_id=dataset["club"], user_id=student.id),
+                MembershipApplication(club_id=dataset["club"], user_id=student.id),
+                EventRegistration(event_id=dataset["event"], user_id=student.id),
+                ClubFounderInvitation(
+                    club_application_id=dataset["application"], invited_student_id=student.id
+                ),
+                Membership(club_id=other.id, user_id=dataset["owner"]),
+                MembershipApplication(club_id=other.id, user_id=dataset["owner"]),
+            ]
+        )
+        start_at = datetime.utcnow() + timedelta(days=3)
+        db.session.add(
+            Event(
+                club_id=other.id,
+                title=f"Proposal {index}",
+                description="About",
+                location="Hall B",
+                start_datetime=start_at,
+                end_datetime=start_at + timedelta(hours=1),
+                capacity=10,
+            )
+        )
+    db.session.commit()
+
+
+def _select_counts(client, query_budget, urls):
+    counts = {}
+    for url in urls:
+        with query_budget(5, max_repeats=3) as recorded:
+            assert client.get(url).status_code == 200
+        counts[url] = recorded[0][1].count
+    return counts
+
+
+def _page_costs(client, query_budget, dataset):
+    costs = {}
+    client.post("/auth/login", data={"email": "admin@example.com", "password": "AdminPass123"})
+    costs.update(
+        _select_counts(
+            client,
+            query_budget,
+            [
+                "/admin/events/proposals",
+                "/admin/club-applications",
+                f"/admin/club-applications/{dataset['application']}",
+                f"/admin/clubs/{dataset['club']}/members",
+            ],
+        )
+    )
+    client.get("/auth/logout")
+
+    client.post("/manager/login", data={"email": "chess@clubs.edu", "password": "Password123"})
+    costs.update(
+        _select_counts(
+            client,
+            query_budget,
+            [
+                f"/manager/events/{dataset['event']}/registrations",
+                "/manager/memberships/applications",
+            ],
+        )
+    )
+    client.get("/manager/logout")
+
+    client.post("/auth/login", data={"email": "student1@example.com", "password": "Password123"})
+    costs.update(_select_counts(client, query_budget, ["/founder-invitations"]))
+    client.get("/auth/logout")
+
+    client.post("/auth/login", data={"email": "owner@example.com", "password": "Password123"})
+    costs.update(
+        _select_counts(
+            client, query_budget, ["/me/clubs", f"/club-applications/{dataset['application']}"]
+        )
+    )
+    client.get("/auth/logout")
+    return costs
+
+
+def test_list_pages_cost_does_not_grow_with_rows(app, client, dataset, query_budget):
+    _add_students(dataset, 1, 2)
+    small = _page_costs(client, query_budget, dataset)
+    _add_students(dataset, 3, 6)
+    assert _page_costs(client, query_budget, dataset) == small
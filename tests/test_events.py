@@ -0,0 +1,96 @@
+import pytest
+
+from app.commands import events_cli
+from app.extensions import db
+from app.models import Event, EventRegistration, EventRegistrationStatus, User
+from app.utils import claim_event_seat, promote_waitlist, release_event_seat
+
+
+@pytest.fixture()
+def event_id(club_and_event):
+    return club_and_event[1]
+
+
+def test_register_and_cancel_maintain_counter(app, client, event_id, login):
+    login("student1@example.com")
+    client.post(f"/events/{event_id}/register")
+    assert db.session.get(Event, event_id).registered_count == 1
+
+    client.post(f"/events/{event_id}/cancel")
+    db.session.expire_all()
+    assert db.session.get(Event, event_id).registered_count == 0
+
+
+def test_recount_repairs_drifted_counter(app, event_id):
+    user = User.query.filter_by(email="student1@example.com").first()
+    db.session.add(EventRegistration(event_id=event_id, user_id=user.id))
+    db.session.get(Event, event_id).registered_count = 5
+    db.session.commit()
+
+    result = app.test_cli_runner().invoke(events_cli, ["recount"])
+    assert "1 event(s)" in result.output
+    db.session.expire_all()
+    assert db.session.get(Event, event_id).registered_count == 1
+    assert (
+        EventRegistration.query.filter_by(status=EventRegistrationStatus.REGISTERED).count()
+        == 1
+    )
+
+
+def test_full_event_waitlists_instead_of_overbooking(app, client, event_id, login):
+    login("student1@example.com")
+    client.post(f"/events/{event_id}/register")
+
+    login("student2@example.com")
+    response = client.post(f"/events/{event_id}/register", follow_redirects=True)
+    assert b"added to the waitlist" in response.data
+    assert b"Waitlist position:</strong> 1" in response.data
+    db.session.expire_all()
+    assert db.session.get(Event, event_id).registered_count == 1
+    statuses = [reg.status for reg in EventRegistration.query.order_by(EventRegistration.id)]
+    assert statuses == [EventRegistrationStatus.REGISTERED, EventRegistrationStatus.WAITLISTED]
+
+
+def test_cancellation_promotes_head_of_waitlist(app, client, event_id, login):
+    for index in (1, 2, 3):
+        login(f"student{index}@example.com")
+        client.post(f"/events/{event_id}/register")
+
+    login("student1@example.com")
+    client.post(f"/events/{event_id}/cancel")
+    db.session.expire_all()
+
+    by_email = {
+        reg.user.email: reg for reg in EventRegistration.query.filter_by(event_id=event_id)
+    }
+    assert by_email["student1@example.com"].status == EventRegistrationStatus.CANCELLED
+    assert by_email["student2@example.com"].status == EventRegistrationStatus.REGISTERED
+    assert by_email["student2@example.com"].waitlist_position is None
+    assert by_email["student3@example.com"].status == EventRegistrationStatus.WAITLISTED
+    assert db.session.get(Event, event_id).registered_count == 1
+    assert by_email["student2@example.com"].user.notifications.count() == 1
+
+
+def test_promotion_fills_every_free_seat_at_once(app, client, event_id, login):
+    for index in (1, 2, 3):
+        login(f"student{index}@example.com")
+        client.post(f"/events/{event_id}/register")
+
+    db.session.get(Event, event_id).capacity = 3
+    db.session.commit()
+    assert len(promote_waitlist(event_id)) == 2
+    db.session.commit()
+    assert db.session.get(Event, event_id).registered_count == 3
+    assert (
+        EventRegistration.query.filter_by(status=EventRegistrationStatus.WAITLISTED).count()
+        == 0
+    )
+
+
+def test_seat_claim_is_guarded_by_capacity(app, event_id):
+    assert claim_event_seat(event_id)
+    assert not claim_event_seat(event_id)
+    release_event_seat(event_id)
+    assert claim_event_seat(event_id)
+    db.session.commit()
+    assert db.session.get(Event, event_id).registered_count == 1
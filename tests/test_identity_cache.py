@@ -0,0 +1,119 @@
+from flask import g
+from werkzeug.security import generate_password_hash
+
+from app.extensions import db
+from app.identity import identity_cache
+from app.instrumentation import query_stats_recorded
+from app.models import Club, ClubManager, ClubStatus, NotificationType, User, UserRole
+from app.utils import create_notification, mark_notifications_read
+
+
+def _identity_selects(app, client, url):
+    recorded = []
+
+    def receiver(sender, endpoint, stats):
+        recorded.append(stats)
+
+    # The test app context outlives requests; start from a fresh session and
+    # an unloaded current_user, as a production request would.
+    db.session.remove()
+    g.pop("_login_user", None)
+    with query_stats_recorded.connected_to(receiver, app):
+        response = client.get(url)
+    assert response.status_code == 200
+    return [
+        shape
+        for shape in recorded[0].shapes
+        if any(
+            f"WHERE {table}.id = ?" in shape for table in ("users", "club_managers", "clubs")
+        )
+    ]
+
+
+def _manager(app):
+    club = Club(name="Chess Club", description="Chess", status=ClubStatus.APPROVED)
+    db.session.add(club)
+    db.session.flush()
+    manager = ClubManager(
+        club_id=club.id,
+        email="chess@clubs.edu",
+        password_hash=generate_password_hash("ManagerPass123"),
+    )
+    db.session.add(manager)
+    db.session.commit()
+    return manager
+
+
+def test_cached_identity_skips_loader_queries(app, client):
+    student = User(
+        role=UserRole.STUDENT,
+        name="Ada",
+        surname="Lovelace",
+        email="ada@example.com",
+        password_hash=generate_password_hash("StudentPass123"),
+    )
+    db.session.add(student)
+    db.session.commit()
+    client.post("/auth/login", data={"email": "ada@example.com", "password": "StudentPass123"})
+
+    assert _identity_selects(app, client, "/dashboard")
+    assert not _identity_selects(app, client, "/dashboard")
+    restored = g._login_user
+    assert restored in db.session and restored.name == "Ada"
+
+
+def test_unread_counter_changes_invalidate_cached_identity(app, client):
+    student = User(
+        role=UserRole.STUDENT,
+        name="Ada",
+        surname="Lovelace",
+        email="ada@example.com",
+        password_hash=generate_password_hash("StudentPass123"),
+    )
+    db.session.add(student)
+    db.session.commit()
+    key = student.get_id()
+    client.post("/auth/login", data={"email": "ada@example.com", "password": "StudentPass123"})
+    _identity_selects(app, client, "/dashboard")
+    assert identity_cache(app).get(key)["values"]["unread_notifications"] == 0
+
+    create_notification(student.id, NotificationType.ANNOUNCEMENT, "Hello", "Welcome")
+    assert identity_cache(app).get(key) is not None
+    db.session.commit()
+    assert identity_cache(app).get(key) is None
+    assert b'<span class="badge">1</span>' in client.get("/dashboard").data
+
+    mark_notifications_read(student.id)
+    db.session.commit()
+    assert identity_cache(app).get(key) is None
+    assert b'class="badge"' not in client.get("/dashboard").data
+
+
+def test_role_change_invalidates_cached_identity(app, client, admin_user):
+    key = User.query.filter_by(email="admin@example.com").one().get_id()
+    client.post("/auth/login", data={"email": "admin@example.com", "password": "AdminPass123"})
+    _identity_selects(app, client, "/admin/dashboard")
+    assert identity_cache(app).get(key) is not None
+
+    admin = db.session.get(User, int(key.split(":")[1]))
+    admin.role = UserRole.STUDENT
+    db.session.flush()
+    assert identity_cache(app).get(key) is not None
+    db.session.commit()
+    assert identity_cache(app).get(key) is None
+    assert client.get("/admin/dashboard").status_code == 403
+
+
+def test_manager_club_is_cached_with_the_manager(app, client):
+    key = _manager(app).get_id()
+    client.post("/manager/login", data={"email": "chess@clubs.edu", "password": "ManagerPass123"})
+
+    assert _identity_selects(app, client, "/manager/club/profile")
+    assert not _identity_selects(app, client, "/manager/club/profile")
+
+    client.post(
+        "/manager/club/profile",
+        data={"name": "Chess Society", "description": "Chess", "category": "Games"},
+    )
+    assert identity_cache(app).get(key) is None
+    assert b"Chess Society" in client.get("/manager/club/profile").data
@@ -0,0 +1,62 @@
+from datetime import datetime
+
+from app.extensions import db
+from app.jobs import TASKS, deferrable, enqueue, run_worker
+from app.models import (
+    AuditActorType,
+    AuditLog,
+    Job,
+    JobStatus,
+    Notification,
+    NotificationType,
+    User,
+)
+from app.utils import create_notification, log_audit
+
+
+def _drain(app):
+    run_worker(app, threads=1, poll_interval=0, batch_size=10, once=True)
+    db.session.expire_all()
+
+
+def test_side_effects_are_enqueued_and_drained(app, admin_user):
+    admin_id = User.query.filter_by(email="admin@example.com").one().id
+    app.config["JOBS_DEFER_SIDE_EFFECTS"] = True
+    enqueued_from = datetime.utcnow()
+    create_notification(admin_id, NotificationType.EVENT_STATUS, "Event Approved", "Yes")
+    log_audit(AuditActorType.USER_ADMIN, admin_id, "approve_event", "Event", 1)
+    db.session.commit()
+    enqueued_until = datetime.utcnow()
+    assert Job.query.count() == 2
+    assert Notification.query.count() == 0
+
+    _drain(app)
+    assert Job.query.count() == 0
+    note = Notification.query.one()
+    assert note.type == NotificationType.EVENT_STATUS
+    audit = AuditLog.query.one()
+    assert audit.actor_type == AuditActorType.USER_ADMIN
+    assert enqueued_from <= note.created_at <= audit.created_at <= enqueued_until
+
+
+def test_failing_job_is_retried_then_marked_failed(app):
+    calls = []
+
+    @deferrable("test_always_fails")
+    def always_fails(value):
+        calls.append(value)
+        raise RuntimeError("boom")
+
+    try:
+        app.config["JOBS_MAX_ATTEMPTS"] = 1
+        enqueue("test_always_fails", 42)
+        db.session.commit()
+
+        _drain(app)
+        job = Job.query.one()
+        assert calls == [42]
+        assert job.status == JobStatus.FAILED
+        assert job.attempts == 1
+        assert "boom" in job.last_error
+    finally:
+        TASKS.pop("test_always_fails", None)
@@ -0,0 +1,43 @@
+import re
+
+import pytest
+
+from app.extensions import db
+from app.models import Club, ClubStatus
+
+
+@pytest.fixture()
+def student_client(app, client, make_student, login):
+    db.session.add(make_student(1))
+    for index in range(5):
+        db.session.add(
+            Club(name=f"Club {index}", description="About", status=ClubStatus.APPROVED)
+        )
+    db.session.add(Club(name="Club Pending", description="About"))
+    db.session.commit()
+    app.config["ITEMS_PER_PAGE"] = 2
+    login("student1@example.com")
+    return client
+
+
+def _club_names(html):
+    return re.findall(r">(Club [\w ]+)</a>", html)
+
+
+def test_club_listing_walks_keyset_pages(student_client):
+    seen = []
+    url = "/clubs"
+    while url:
+        html = student_client.get(url).get_data(as_text=True)
+        assert "5 clubs" in html
+        seen.extend(_club_names(html))
+        match = re.search(r'href="(/clubs\?cursor=[^"]+)">Next', html)
+        url = match.group(1) if match else None
+    assert seen == [f"Club {index}" for index in range(5)]
+
+
+def test_club_listing_supports_page_numbers(app, student_client):
+    app.config["LISTING_PAGINATION"] = "offset"
+    html = student_client.get("/clubs?page=3").get_data(as_text=True)
+    assert _club_names(html) == ["Club 4"]
+    assert "Page 3 of 3" in html
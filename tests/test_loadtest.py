@@ -0,0 +1,15 @@
+from scripts.loadtest import FlaskClientSession, build_dataset, run_load_test, summarize
+
+
+def test_load_harness_replays_mix_without_errors(app):
+    dataset = build_dataset(students=40, clubs=3)
+    recorder, elapsed = run_load_test(
+        lambda recorder: FlaskClientSession(app, recorder), dataset, total_requests=60, concurrency=1
+    )
+    report = summarize(recorder, elapsed)
+
+    assert report["errors"] == 0
+    assert report["requests"] >= 60
+    assert {"student.login", "manager.login", "admin.login"} <= set(report["endpoints"])
+    for stats in report["endpoints"].values():
+        assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"] <= stats["max_ms"]
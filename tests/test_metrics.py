@@ -0,0 +1,74 @@
+import json
+import os
+
+from app.extensions import db
+from app.jobs import enqueue
+
+
+def _login_admin(client):
+    client.post("/auth/login", data={"email": "admin@example.com", "password": "AdminPass123"})
+
+
+def test_metrics_require_admin_or_token(app, client, admin_user):
+    assert client.get("/admin/metrics").status_code == 302
+
+    app.config["METRICS_TOKEN"] = "scrape-secret"
+    response = client.get("/admin/metrics", headers={"Authorization": "Bearer scrape-secret"})
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    assert client.get("/admin/metrics", headers={"Authorization": "Bearer nope"}).status_code == 302
+
+
+def test_metrics_report_requests_pool_and_queue(app, client, admin_user):
+    enqueue("noop")
+    db.session.commit()
+    _login_admin(client)
+    client.get("/admin/dashboard")
+    client.get("/admin/dashboard")
+
+    body = client.get("/admin/metrics").get_data(as_text=True)
+    assert (
+        'http_requests_total{endpoint="admin.dashboard",method="GET",status="200"} 2' in body
+    )
+    assert 'http_request_duration_seconds_bucket{endpoint="admin.dashboard",le="+Inf"} 2' in body
+    assert 'http_request_duration_seconds_count{endpoint="admin.dashboard"} 2' in body
+    assert 'jobs_queue_depth{status="PENDING"} 1' in body
+    assert 'jobs_queue_depth{status="FAILED"} 0' in body
+    assert "db_pool_checkouts_total " in body
+
+
+def test_metrics_merge_worker_snapshots(app, client, admin_user, tmp_path):
+    app.config["METRICS_DIR"] = str(tmp_path)
+    buckets = len(app.config["METRICS_LATENCY_BUCKETS"])
+    other_worker = {
+        "pid": os.getpid() + 100000,
+        "requests": [["admin.dashboard", "GET", "200", 5]],
+        "latency": {
+            "admin.dashboard": {"buckets": [5] + [0] * (buckets - 1), "sum": 0.01, "count": 5}
+        },
+        "pool_checkouts": 7,
+        "pool_checked_out": 3,
+    }
+    (tmp_path / "worker.json").write_text(json.dumps(other_worker))
+    _login_admin(client)
+    client.get("/admin/dashboard")
+
+    body = client.get("/admin/metrics").get_data(as_text=True)
+    assert (
+        'http_requests_total{endpoint="admin.dashboard",method="GET",status="200"} 6' in body
+    )
+    assert 'http_request_duration_seconds_bucket{endpoint="admin.dashboard",le="0.005"}' in body
+    assert "db_pool_checked_out 3" not in body
+    assert (tmp_path / f"{os.getpid()}.json").exists()
+
+
+def test_metrics_count_requests_rejected_by_csrf(app, client):
+    app.config["WTF_CSRF_ENABLED"] = True
+    app.config["METRICS_TOKEN"] = "scrape-secret"
+    response = client.post("/auth/login", data={"email": "a@example.com", "password": "x"})
+    assert response.status_code == 400
+
+    body = client.get(
+        "/admin/metrics", headers={"Authorization": "Bearer scrape-secret"}
+    ).get_data(as_text=True)
+    assert 'http_requests_total{endpoint="auth.login",method="POST",status="400"} 1' in body
@@ -0,0 +1,22 @@
+import random
+
+from scripts.microbench import BENCHMARKS, compare, run_benchmarks
+
+
+def test_every_benchmark_runs():
+    results = run_benchmarks(samples=2)
+    assert set(results) == set(BENCHMARKS)
+    assert all(len(samples) == 2 and min(samples) > 0 for samples in results.values())
+
+
+def test_compare_flags_only_significant_slowdowns():
+    rng = random.Random(7)
+    baseline = {name: [rng.gauss(1000, 20) for _ in range(30)] for name in ("a", "b", "c")}
+    current = {
+        "a": [rng.gauss(1000, 20) for _ in range(30)],
+        "b": [rng.gauss(1300, 20) for _ in range(30)],
+        "c": [rng.gauss(700, 20) for _ in range(30)],
+        "d": [5.0, 6.0],
+    }
+    statuses = {row["name"]: row["status"] for row in compare(baseline, current)}
+    assert statuses == {"a": "same", "b": "slower", "c": "faster", "d": "new"}
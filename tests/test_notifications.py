@@ -0,0 +1,195 @@
+import re
+from datetime import datetime, timedelta
+
+import pytest
+from werkzeug.security import generate_password_hash
+
+from app.extensions import db
+from app.models import (
+    Announcement,
+    Club,
+    ClubManager,
+    ClubStatus,
+    Membership,
+    Notification,
+    NotificationArchive,
+    NotificationType,
+    User,
+)
+from app.utils import create_notification, create_notifications, encode_cursor
+
+
+@pytest.fixture()
+def club_with_members(app, make_student):
+    students = [make_student(index) for index in range(3)]
+    club = Club(name="Chess Club", description="Play chess", status=ClubStatus.APPROVED)
+    db.session.add_all([club, *students])
+    db.session.flush()
+    db.session.add_all(
+        [
+            ClubManager(
+                club_id=club.id,
+                email="chess@clubs.edu",
+                password_hash=generate_password_hash("Password123"),
+            ),
+            Membership(club_id=club.id, user_id=students[0].id),
+            Membership(club_id=club.id, user_id=students[1].id),
+            Membership(club_id=club.id, user_id=students[2].id, is_active=False),
+        ]
+    )
+    db.session.commit()
+    return club, students
+
+
+def test_announcement_fans_out_to_active_members(app, client, club_with_members, login):
+    club, students = club_with_members
+    login("chess@clubs.edu", path="/manager/login")
+    client.post("/manager/announcements/new", data={"title": "Meetup", "body": "Friday"})
+
+    announcement = Announcement.query.one()
+    notes = Notification.query.order_by(Notification.user_id).all()
+    assert [note.user_id for note in notes] == [students[0].id, students[1].id]
+    for note in notes:
+        assert note.type == NotificationType.ANNOUNCEMENT
+        assert note.title == "Chess Club Announcement"
+        assert note.body == "Meetup"
+        assert note.is_read is False
+        assert note.related_object_id == announcement.id
+
+
+def test_bulk_notifications_from_id_list(app, club_with_members, monkeypatch):
+    _, students = club_with_members
+    monkeypatch.setattr("app.utils.NOTIFICATION_CHUNK_SIZE", 2)
+    created = create_notifications(
+        [student.id for student in students],
+        NotificationType.FOUNDER_INVITE,
+        "Founder Invitation",
+        "Join us",
+    )
+    db.session.commit()
+    assert created == 3
+    assert Notification.query.filter_by(type=NotificationType.FOUNDER_INVITE).count() == 3
+
+
+def test_notifications_inbox_pages_by_cursor(app, client, club_with_members, login):
+    _, students = club_with_members
+    app.config["NOTIFICATIONS_PER_PAGE"] = 4
+    created_at = datetime(2026, 1, 1, 12, 0)
+    for index in range(6):
+        create_notification(
+            students[0].id,
+            NotificationType.ANNOUNCEMENT,
+            f"Note {index}",
+            "Body",
+            created_at=created_at if index < 5 else created_at + timedelta(hours=1),
+        )
+    db.session.commit()
+    login("student0@example.com")
+
+    first = client.get("/notifications").get_data(as_text=True)
+    assert [f"Note {index}" in first for index in (5, 4, 3, 2, 1, 0)] == [
+        True, True, True, True, False, False
+    ]
+    cursor = re.search(r'cursor=([\w-]+)">Load more', first).group(1)
+
+    second = client.get(f"/notifications?cursor={cursor}").get_data(as_text=True)
+    assert "Note 1" in second and "Note 0" in second
+    assert "Note 2" not in second
+    assert "Load more" not in second
+
+
+def test_unread_badge_follows_counter(app, client, club_with_members, login):
+    club, students = club_with_members
+    login("chess@clubs.edu", path="/manager/login")
+    client.post("/manager/announcements/new", data={"title": "Meetup", "body": "Friday"})
+    client.post("/manager/announcements/new", data={"title": "Reminder", "body": "Today"})
+    client.get("/manager/logout")
+    db.session.expire_all()
+    assert db.session.get(User, students[0].id).unread_notifications == 2
+    assert db.session.get(User, students[2].id).unread_notifications == 0
+
+    login("student0@example.com")
+    assert '<span class="badge">2</span>' in client.get("/dashboard").get_data(as_text=True)
+
+    note = Notification.query.filter_by(user_id=students[0].id).first()
+    client.post("/notifications", data={"notification_id": note.id})
+    client.post("/notifications", data={"notification_id": note.id})
+    assert '<span class="badge">1</span>' in client.get("/dashboard").get_data(as_text=True)
+
+    db.session.get(User, students[0].id).unread_notifications = 7
+    db.session.commit()
+    result = app.test_cli_runner().invoke(args=["notifications", "recount"])
+    assert "1 user(s)" in result.output
+    db.session.expire_all()
+    assert db.session.get(User, students[0].id).unread_notifications == 1
+
+
+def test_bulk_mark_read_actions(app, client, club_with_members, login):
+    _, students = club_with_members
+    user_id = students[0].id
+    base = datetime(2026, 1, 1, 12, 0)
+    for index in range(6):
+        create_notification(
+            user_id,
+            NotificationType.ANNOUNCEMENT,
+            f"Note {index}",
+            "Body",
+            created_at=base + timedelta(minutes=index),
+        )
+    db.session.commit()
+    notes = Notification.query.order_by(Notification.created_at).all()
+    login("student0@example.com")
+
+    def unread():
+        db.session.expire_all()
+        return db.session.get(User, user_id).unread_notifications
+
+    client.post(
+        "/notifications",
+        data={"action": "selected", "notification_id": [notes[5].id, notes[4].id]},
+    )
+    assert unread() == 4
+
+    client.post(
+        "/notifications",
+        data={"action": "older", "before": encode_cursor([notes[2].created_at, notes[2].id])},
+    )
+    assert [note.is_read for note in notes] == [True, True, False, False, True, True]
+    assert unread() == 2
+
+    client.post("/notifications", data={"action": "all"})
+    assert unread() == 0
+    assert Notification.query.filter_by(is_read=False).count() == 0
+
+
+def test_archive_moves_only_expired_read_notifications(app, club_with_members):
+    _, students = club_with_members
+    user_id = students[0].id
+    old = datetime.utcnow() - timedelta(days=45)
+    specs = [
+        (NotificationType.ANNOUNCEMENT, old, True),
+        (NotificationType.ANNOUNCEMENT, old, True),
+        (NotificationType.ANNOUNCEMENT, old, False),
+        (NotificationType.ANNOUNCEMENT, datetime.utcnow(), True),
+        (NotificationType.CLUB_APP_DECISION, old, True),
+    ]
+    for ntype, created_at, is_read in specs:
+        db.session.add(
+            Notification(
+                user_id=user_id,
+                type=ntype,
+                title="Title",
+                body="Body",
+                created_at=created_at,
+                is_read=is_read,
+            )
+        )
+    db.session.commit()
+
+    result = app.test_cli_runner().invoke(
+        args=["notifications", "archive", "--batch-size", "1"]
+    )
+    assert "ANNOUNCEMENT: archived 2 notification(s)." in result.output
+    assert NotificationArchive.query.count() == 2
+    assert Notification.query.count() == 3
+    assert {archived.user_id for archived in NotificationArchive.query} == {user_id}
@@ -0,0 +1,70 @@
+import time
+
+from app.extensions import db
+from app.models import User
+from app.passwords import PasswordHasher, init_password_hasher
+
+
+def _admin():
+    return User.query.filter_by(email="admin@example.com").one()
+
+
+def test_login_rehashes_outdated_password_hash(app, client, admin_user):
+    assert _admin().password_hash.startswith("scrypt:")
+
+    response = client.post(
+        "/auth/login", data={"email": "admin@example.com", "password": "AdminPass123"}
+    )
+    assert response.status_code == 302
+    db.session.expire_all()
+    stored = _admin().password_hash
+    assert stored.startswith(app.config["PASSWORD_HASH_METHOD"] + "$")
+
+    client.get("/auth/logout")
+    response = client.post(
+        "/auth/login", data={"email": "admin@example.com", "password": "AdminPass123"}
+    )
+    assert response.status_code == 302
+    db.session.expire_all()
+    assert _admin().password_hash == stored
+
+
+def test_login_returns_503_when_hashing_pool_is_saturated(app, client, admin_user):
+    hasher = PasswordHasher(app.config["PASSWORD_HASH_METHOD"], workers=1, queue=0, timeout=0.05)
+    app.extensions["password_hasher"] = hasher
+    hasher.slots.acquire()
+    try:
+        response = client.post(
+            "/auth/login", data={"email": "admin@example.com", "password": "AdminPass123"}
+        )
+    finally:
+        hasher.slots.release()
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert b"Server busy" in response.data
+
+
+def test_started_hash_is_not_abandoned_after_timeout():
+    hasher = PasswordHasher("pbkdf2:sha256:1000", workers=1, queue=0, timeout=0.01)
+
+    def slow_hash():
+        time.sleep(0.05)
+        return "done"
+
+    assert hasher._run(slow_hash) == "done"
+
+
+def test_shorthand_method_does_not_rehash_every_login(app, client, admin_user):
+    app.config["PASSWORD_HASH_METHOD"] = "pbkdf2:sha256"
+    init_password_hasher(app)
+    data = {"email": "admin@example.com", "password": "AdminPass123"}
+
+    client.post("/auth/login", data=data)
+    db.session.expire_all()
+    stored = _admin().password_hash
+    assert stored.startswith("pbkdf2:sha256:")
+
+    client.get("/auth/logout")
+    client.post("/auth/login", data=data)
+    db.session.expire_all()
+    assert _admin().password_hash == stored
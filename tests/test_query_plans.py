@@ -0,0 +1,272 @@
+import re
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from flask import g
+from sqlalchemy import event as sa_event
+from sqlalchemy.exc import OperationalError
+from werkzeug.security import generate_password_hash
+
+from app.extensions import db
+from app.models import (
+    Announcement,
+    Club,
+    ClubApplication,
+    ClubFounderInvitation,
+    ClubManager,
+    ClubStatus,
+    Event,
+    EventRegistration,
+    EventStatus,
+    Membership,
+    MembershipApplication,
+    Notification,
+    NotificationType,
+    User,
+    UserRole,
+)
+from app.instrumentation import QueryStats
+from app.utils import encode_cursor
+
+
+TABLE_SCAN = re.compile(r"^SCAN (\w+)$")
+
+
+@contextmanager
+def capture_query_plans():
+    plans = []
+    engine = db.engine
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if executemany or not statement.lstrip().upper().startswith("SELECT"):
+            return
+        explain = conn.connection.dbapi_connection.cursor()
+        try:
+            explain.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            details = [row[3] for row in explain.fetchall()]
+        finally:
+            explain.close()
+        plans.append((statement, details))
+
+    sa_event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield plans
+    finally:
+        sa_event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _table_scans(plans):
+    offenders = []
+    for statement, details in plans:
+        for detail in details:
+            match = TABLE_SCAN.match(detail)
+            if match and match.group(1) in db.metadata.tables:
+                offenders.append(f"{detail}\n{statement}")
+    return offenders
+
+
+@pytest.fixture()
+def dataset(app):
+    now = datetime.utcnow()
+    password_hash = generate_password_hash("Password123")
+    admin = User(
+        role=UserRole.SKS_ADMIN,
+        name="Admin",
+        surname="User",
+        email="admin@example.com",
+        password_hash=password_hash,
+    )
+    student = User(
+        role=UserRole.STUDENT,
+        name="Student",
+        surname="User",
+        email="student@example.com",
+        university_id="S10001",
+        password_hash=password_hash,
+    )
+    db.session.add_all([admin, student])
+    db.session.flush()
+
+    club = Club(
+        name="Chess Club",
+        description="Play chess",
+        category="Games",
+        status=ClubStatus.APPROVED,
+        applicant_user_id=student.id,
+    )
+    db.session.add(club)
+    db.session.flush()
+    manager = ClubManager(club_id=club.id, email="chess@clubs.edu", password_hash=password_hash)
+    application = ClubApplication(
+        applicant_user_id=student.id,
+        proposed_name="Go Club",
+        proposed_description="Play go",
+    )
+    db.session.add_all([manager, application])
+    db.session.flush()
+
+    event = Event(
+        club_id=club.id,
+        title="Blitz Night",
+        description="Fast games",
+        location="Hall A",
+        start_datetime=now + timedelta(days=7),
+        end_datetime=now + timedelta(days=7, hours=2),
+        capacity=10,
+        status=EventStatus.APPROVED,
+        created_by_manager_id=manager.id,
+    )
+    db.session.add_all(
+        [
+            event,
+            Membership(club_id=club.id, user_id=student.id),
+            MembershipApplication(club_id=club.id, user_id=student.id),
+            ClubFounderInvitation(club_application_id=application.id, invited_student_id=student.id),
+            Announcement(club_id=club.id, title="Welcome", body="Hello"),
+            Notification(
+                user_id=student.id,
+                type=NotificationType.ANNOUNCEMENT,
+                title="Welcome",
+                body="Hello",
+            ),
+        ]
+    )
+    db.session.flush()
+    db.session.add(EventRegistration(event_id=event.id, user_id=student.id))
+    db.session.commit()
+    return {
+        "club_id": club.id,
+        "event_id": event.id,
+        "application_id": application.id,
+    }
+
+
+def _login(client, url, email):
+    client.post(url, data={"email": email, "password": "Password123"})
+
+
+def _assert_no_table_scans(app, client, urls):
+    with app.app_context(), capture_query_plans() as plans:
+        for url in urls:
+            response = client.get(url)
+            assert response.status_code == 200, url
+    assert plans
+    offenders = _table_scans(plans)
+    assert not offenders, "\n\n".join(offenders)
+
+
+def _student_urls(dataset):
+    return [
+        "/dashboard",
+        "/clubs",
+        "/clubs?q=chess",
+        f"/clubs/{dataset['club_id']}",
+        "/me/clubs",
+        f"/club-applications/{dataset['application_id']}",
+        "/founder-invitations",
+        f"/clubs?cursor={encode_cursor(['Backgammon Club', 1])}",
+        "/events",
+        f"/events?club_id={dataset['club_id']}",
+        f"/events?cursor={encode_cursor([datetime.utcnow(), 1])}",
+        f"/events/{dataset['event_id']}",
+        "/notifications",
+        f"/notifications?cursor={encode_cursor([datetime.utcnow(), 1])}",
+    ]
+
+
+def _manager_urls(dataset):
+    return [
+        "/manager/dashboard",
+        "/manager/memberships/applications",
+        "/manager/announcements",
+        "/manager/events",
+        f"/manager/events/{dataset['event_id']}/registrations",
+    ]
+
+
+def _admin_urls(dataset):
+    return [
+        "/admin/dashboard",
+        "/admin/club-applications",
+        f"/admin/club-applications/{dataset['application_id']}",
+        "/admin/events/proposals",
+        "/admin/clubs",
+        f"/admin/clubs/{dataset['club_id']}/members",
+    ]
+
+
+ROLES = [
+    ("/auth/login", "student@example.com", _student_urls),
+    ("/manager/login", "chess@clubs.edu", _manager_urls),
+    ("/auth/login", "admin@example.com", _admin_urls),
+]
+
+
+@pytest.mark.parametrize("login_url, email, urls", ROLES)
+def test_pages_use_indexes(app, client, dataset, login_url, email, urls):
+    _login(client, login_url, email)
+    _assert_no_table_scans(app, client, urls(dataset))
+
+
+@pytest.mark.parametrize("login_url, email, urls", ROLES)
+def test_pages_stay_within_query_budget(client, dataset, query_budget, login_url, email, urls):
+    _login(client, login_url, email)
+    for url in urls(dataset):
+        with query_budget(8, max_repeats=2):
+            assert client.get(url).status_code == 200, url
+
+
+def test_query_stats_group_statements_by_shape():
+    stats = QueryStats()
+    stats.record("SELECT * FROM users WHERE users.id = ?", 0.001)
+    stats.record("SELECT *\n  FROM users WHERE users.id = ?", 0.002)
+    stats.record("SELECT * FROM clubs WHERE clubs.id IN (?, ?)", 0.001)
+    stats.record("SELECT * FROM clubs WHERE clubs.id IN (?, ?, ?)", 0.001)
+    assert stats.count == 4
+    assert stats.repeated(2) == [
+        ("SELECT * FROM users WHERE users.id = ?", 2),
+        ("SELECT * FROM clubs WHERE clubs.id IN (?...)", 2),
+    ]
+
+
+def test_failed_statements_leave_no_timing_state_behind(app):
+    with app.test_request_context():
+        g.query_stats = QueryStats()
+        with db.engine.connect() as connection:
+            for _ in range(3):
+                with pytest.raises(OperationalError):
+                    connection.exec_driver_sql("SELECT * FROM no_such_table")
+            time.sleep(0.05)
+            connection.exec_driver_sql("SELECT 1")
+            assert not connection.info.get("query_start")
+        assert g.query_stats.count == 1
+        assert g.query_stats.duration < 0.05
+
+
+def test_slow_queries_are_logged_with_plan(app, client, dataset, caplog):
+    app.config["SLOW_QUERY_THRESHOLD_MS"] = 0
+    _login(client, "/auth/login", "student@example.com")
+    with caplog.at_level("WARNING", logger="app.slow_query"):
+        client.get(f"/events?club_id={dataset['club_id']}")
+    messages = [record.getMessage() for record in caplog.records]
+    events_query = next(
+        message for message in messages if "FROM events" in message and "LIMIT" in message
+    )
+    assert "endpoint=student.events" in events_query
+    assert "parameters=4 (str, int, int, int)" in events_query
+    assert "'APPROVED'" not in events_query
+    assert "SEARCH events USING INDEX ix_events_club_status_start" in events_query
+
+
+def test_slow_query_log_leaves_out_parameter_values(app, client, admin_user, caplog):
+    app.config["SLOW_QUERY_THRESHOLD_MS"] = 0
+    with caplog.at_level("WARNING", logger="app.slow_query"):
+        client.post("/auth/login", data={"email": "admin@example.com", "password": "AdminPass123"})
+    messages = [record.getMessage() for record in caplog.records]
+    rehash = next(message for message in messages if "UPDATE users SET password_hash" in message)
+    assert "parameters=" in rehash
+    assert "pbkdf2:" not in rehash
+    assert "plan:\n  -" in rehash
+    assert not any("admin@example.com" in message for message in messages)
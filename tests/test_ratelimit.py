@@ -0,0 +1,67 @@
+from app.ratelimit import MemoryBackend, RateLimiter, SQLiteBackend
+
+
+def test_sliding_window_forgets_old_hits_gradually():
+    limiter = RateLimiter(MemoryBackend(max_keys=10), limit=3, window=60)
+    for _ in range(3):
+        limiter.hit("ip", now=600)
+    assert limiter.blocked("ip", now=610)
+    # Half of the previous window still overlaps: 3 * 0.5 < 3.
+    assert not limiter.blocked("ip", now=690)
+    limiter.hit("ip", now=690)
+    limiter.hit("ip", now=690)
+    assert limiter.blocked("ip", now=690)
+    assert not limiter.blocked("ip", now=900)
+
+
+def test_memory_backend_evicts_least_recently_used_keys():
+    backend = MemoryBackend(max_keys=2)
+    limiter = RateLimiter(backend, limit=1, window=60)
+    limiter.hit("a", now=0)
+    limiter.hit("b", now=0)
+    limiter.hit("a", now=1)
+    limiter.hit("c", now=2)
+    assert list(backend.entries) == ["a", "c"]
+
+
+def test_sqlite_backend_is_shared_between_limiters(tmp_path):
+    path = tmp_path / "ratelimit.db"
+    first = RateLimiter(SQLiteBackend(path, max_keys=100), limit=2, window=60)
+    second = RateLimiter(SQLiteBackend(path, max_keys=100), limit=2, window=60)
+    first.hit("ip", now=0)
+    assert not second.blocked("ip", now=1)
+    second.hit("ip", now=1)
+    assert first.blocked("ip", now=2)
+
+
+def test_login_is_blocked_after_repeated_failures(client, admin_user):
+    for _ in range(5):
+        response = client.post(
+            "/auth/login", data={"email": "admin@example.com", "password": "wrong"}
+        )
+        assert b"Invalid credentials" in response.data
+    response = client.post(
+        "/auth/login", data={"email": "admin@example.com", "password": "AdminPass123"}
+    )
+    assert response.status_code == 200
+    assert b"Too many login attempts" in response.data
+
+    response = client.post(
+        "/manager/login", data={"email": "nobody@clubs.edu", "password": "wrong"}
+    )
+    assert b"Invalid credentials" in response.data
+
+
+def test_sqlite_backend_creates_its_file_on_first_use(tmp_path, monkeypatch):
+    path = tmp_path / "instance" / "ratelimit.db"
+    backend = SQLiteBackend(path, max_keys=2)
+    limiter = RateLimiter(backend, limit=1, window=60)
+    assert not path.exists()
+    assert not limiter.blocked("a", now=0)
+    assert path.exists()
+
+    monkeypatch.setattr(SQLiteBackend, "PRUNE_PROBABILITY", 1)
+    for key in "abc":
+        limiter.hit(key, now=0)
+    keys = backend._connect().execute("SELECT key FROM rate_limits ORDER BY key").fetchall()
+    assert keys == [("b",), ("c",)]
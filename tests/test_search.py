@@ -0,0 +1,65 @@
+import re
+
+import pytest
+from werkzeug.security import generate_password_hash
+
+from app.extensions import db
+from app.models import Club, ClubStatus, User, UserRole
+from app.search import index_club
+
+
+@pytest.fixture()
+def student_client(app, client):
+    db.session.add(
+        User(
+            role=UserRole.STUDENT,
+            name="Student",
+            surname="User",
+            email="student@example.com",
+            university_id="S10001",
+            password_hash=generate_password_hash("Password123"),
+        )
+    )
+    clubs = [
+        Club(name="Robotics Society", category="Engineering", description="Build robots"),
+        Club(name="Maker Space", category="Robotics", description="Tools and workshops"),
+        Club(name="Film Club", category="Arts", description="We film robotics contests"),
+        Club(name="Chess Club", category="Games", description="Play chess"),
+        Club(name="Robotics Draft", category="Engineering", description="Pending approval"),
+    ]
+    for club in clubs[:4]:
+        club.status = ClubStatus.APPROVED
+    db.session.add_all(clubs)
+    db.session.flush()
+    for club in clubs:
+        index_club(club)
+    db.session.commit()
+    client.post("/auth/login", data={"email": "student@example.com", "password": "Password123"})
+    return client
+
+
+def _club_names(html):
+    return re.findall(r'href="/clubs/\d+">([^<]+)</a>', html)
+
+
+def test_search_ranks_name_over_category_over_description(student_client):
+    html = student_client.get("/clubs?q=robot").get_data(as_text=True)
+    assert _club_names(html) == ["Robotics Society", "Maker Space", "Film Club"]
+
+
+def test_index_club_replaces_stale_entry(app, student_client):
+    club = Club.query.filter_by(name="Chess Club").one()
+    club.description = "Chess and robot battles"
+    index_club(club)
+    db.session.commit()
+    html = student_client.get("/clubs?q=battles").get_data(as_text=True)
+    assert _club_names(html) == ["Chess Club"]
+
+
+def test_reindex_command_rebuilds_index(app, student_client):
+    db.session.execute(db.text("DELETE FROM club_search"))
+    db.session.commit()
+    result = app.test_cli_runner().invoke(args=["clubs", "reindex"])
+    assert "Indexed 5 club(s)." in result.output
+    html = student_client.get("/clubs?q=chess").get_data(as_text=True)
+    assert _club_names(html) == ["Chess Club"]
@@ -0,0 +1,74 @@
+from sqlalchemy import func, select
+
+import config
+from app import create_app
+from app.extensions import db
+from app.models import (
+    Club,
+    ClubManager,
+    Event,
+    EventRegistration,
+    Membership,
+    MembershipApplication,
+    Notification,
+    User,
+)
+from app.utils import recount_event_registrations, recount_unread_notifications
+from scripts.seed import seed_bulk_data
+
+
+def _pragmas(engine):
+    with engine.connect() as connection:
+        return {
+            name: connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+            for name in ("journal_mode", "synchronous")
+        }
+
+
+def test_bulk_seed_counts_and_restores_pragmas(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        config.TestingConfig,
+        "SQLALCHEMY_DATABASE_URI",
+        f"sqlite:///{(tmp_path / 'bulk.db').as_posix()}",
+    )
+    # One pooled connection, so the pragma check sees the one the bulk load used.
+    monkeypatch.setattr(
+        config.TestingConfig,
+        "SQLALCHEMY_ENGINE_OPTIONS",
+        {"pool_size": 1, "max_overflow": 0},
+        raising=False,
+    )
+    app = create_app("testing")
+    with app.app_context():
+        before = _pragmas(db.engine)
+        dataset = seed_bulk_data(
+            students=30,
+            clubs=4,
+            members_per_club=5,
+            applications_per_club=2,
+            events_per_club=3,
+            pending_events_per_club=1,
+            registrations_per_event=6,
+            notifications_per_student=3,
+            batch_size=7,
+        )
+        assert len(dataset["event_ids"]) == 4 * 2
+        assert len(dataset["pending_event_ids"]) == 4
+        assert sum(map(len, dataset["pending_applications"].values())) == 4 * 2
+        assert dataset["registrations"] == 4 * 2 * 6
+
+        def count(model):
+            return db.session.scalar(select(func.count()).select_from(model))
+
+        assert count(User) == 31
+        assert count(Club) == 4
+        assert count(ClubManager) == 4
+        assert count(Membership) == 4 * 5
+        assert count(MembershipApplication) == 4 * 2
+        assert count(Event) == 4 * 3
+        assert count(EventRegistration) == 4 * 2 * 6
+        assert count(Notification) == 30 * 3
+        assert recount_event_registrations() == 0
+        assert recount_unread_notifications() == 0
+        db.session.remove()
+        assert _pragmas(db.engine) == before
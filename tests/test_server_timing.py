@@ -0,0 +1,33 @@
+import re
+
+
+def _timings(response):
+    return {
+        name: float(duration)
+        for name, duration in re.findall(r"(\w+);dur=([\d.]+)", response.headers["Server-Timing"])
+    }
+
+
+def test_pages_report_server_timing(client, admin_user):
+    client.post("/auth/login", data={"email": "admin@example.com", "password": "AdminPass123"})
+    response = client.get("/admin/dashboard")
+    timings = _timings(response)
+    assert set(timings) == {"db", "tpl", "view"}
+    assert timings["view"] >= timings["db"]
+    assert timings["view"] >= timings["tpl"] > 0
+    assert re.search(r'desc="[1-9]\d* queries"', response.headers["Server-Timing"])
+
+
+def test_redirects_report_no_template_time(client):
+    response = client.get("/admin/dashboard")
+    assert response.status_code == 302
+    assert _timings(response)["tpl"] == 0
+
+
+def test_csrf_failure_skips_timing_and_keeps_its_status(app, client):
+    app.config["WTF_CSRF_ENABLED"] = True
+    response = client.post(
+        "/auth/login", data={"email": "admin@example.com", "password": "AdminPass123"}
+    )
+    assert response.status_code == 400
+    assert "Server-Timing" not in response.headers